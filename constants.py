@@ -216,4 +216,7 @@ DEV_INDEX_KEYS = (
 # RATIONALE: Growth dimensions tracked by the system.
 
 ORCHESTRATOR_HEARTBEAT_SEC = int(os.getenv("ORCHESTRATOR_HEARTBEAT_SEC", "60"))
-# RATIONALE: Interval for background heartbeat loop.
\ No newline at end of file
+# RATIONALE: Interval for background heartbeat loop.
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# RATIONALE: Caps in-flight relational LLM requests so bursts stay under provider rate limits.
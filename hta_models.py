@@ -39,6 +39,11 @@ class HTAResponseModel(BaseModel):
     class Config:
         extra = "ignore"
 
+# --- Resolve forward refs & build validators at import ---
+# Done eagerly so the first LLM response doesn't pay for core-schema construction.
+HTANodeModel.model_rebuild()
+HTAResponseModel.model_rebuild()
+
 # --- Make models easily importable ---
 __all__ = [
     "HTANodeModel",
@@ -27,6 +27,7 @@ class HTANode:
         estimated_time: A string (e.g., "low", "medium", "high") representing time cost.
         children: A list of child HTANode objects.
         linked_tasks: A list of task IDs linked to this node.
+        relevant_indexes: Development-index dimensions this node helps grow.
     """
 
     def __init__(
@@ -39,6 +40,7 @@ class HTANode:
         estimated_energy: str = "medium",
         estimated_time: str = "medium",
         children: Optional[List["HTANode"]] = None,
+        relevant_indexes: Optional[List[str]] = None,
     ):
         self.id = id
         self.title = title
@@ -50,6 +52,7 @@ class HTANode:
         self.estimated_time = estimated_time
         self.children = children if children is not None else []
         self.linked_tasks: List[str] = []
+        self.relevant_indexes = relevant_indexes if relevant_indexes is not None else []
 
     def link_task(self, task_id: str):
         """Links a task ID with this node."""
@@ -140,6 +143,7 @@ class HTANode:
             "estimated_time": self.estimated_time,
             "children": [child.to_dict() for child in self.children],
             "linked_tasks": self.linked_tasks,
+            "relevant_indexes": self.relevant_indexes,
         }
 
     @classmethod
@@ -156,6 +160,7 @@ class HTANode:
             estimated_energy=data.get("estimated_energy", "medium"),
             estimated_time=data.get("estimated_time", "medium"),
             children=children,
+            relevant_indexes=data.get("relevant_indexes", []),
         )
         node.status = data.get("status", "pending")
         node.linked_tasks = data.get("linked_tasks", [])
@@ -186,13 +191,16 @@ class HTATree:
         if not self.root:
             return []
 
-        def _flatten(node: HTANode) -> List[HTANode]:
-            nodes = [node]
-            for child in node.children:
-                nodes.extend(_flatten(child))
-            return nodes
-
-        return _flatten(self.root)
+        # Iterative pre-order walk (children pushed reversed so they pop in order);
+        # no recursion frames and no per-level intermediate lists
+        nodes: List[HTANode] = []
+        append, stack = nodes.append, [self.root]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            node = pop()
+            append(node)
+            extend(reversed(node.children))
+        return nodes
 
     def propagate_status(self):
         """
@@ -225,16 +233,15 @@ class HTATree:
         if not self.root:
             return None
 
-        def _find(node: HTANode) -> Optional[HTANode]:
+        # Same pre-order as flatten, stopping at the first match; iterative so
+        # deep plans can't hit the recursion limit
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
             if node.id == node_id:
                 return node
-            for child in node.children:
-                found = _find(child)
-                if found:
-                    return found
-            return None
-
-        return _find(self.root)
+            stack.extend(reversed(node.children))
+        return None
 
     def add_node(self, parent_id: str, new_node: HTANode) -> bool:
         """
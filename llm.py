@@ -49,6 +49,8 @@ except ImportError:
         llm_pool_timeout: Optional[float] = None
     settings = DummySettings()
 
+from forest_app.core.utils import loads_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,6 +107,10 @@ class SentimentResponseModel(BaseModel):
 
 # Note: HTAResponseModel is imported from hta_models.py above
 
+# Build validators at import so the first request doesn't pay for schema construction.
+LLMResponseModel.model_rebuild()
+SentimentResponseModel.model_rebuild()
+
 
 # --- Retry Configuration ---
 RETRYABLE_STATUS_CODES = {500, 502, 503, 504, 408, 429}
@@ -220,22 +226,27 @@ async def generate_response(
 
         try:
             # Handle Ollama's nested JSON response when format=json is used
-            outer_json = json.loads(response_text)
+            outer_json = loads_json(response_text)
             if 'response' in outer_json and isinstance(outer_json['response'], str):
                  inner_json_str = outer_json['response']
+                 inner_json_str_cleaned = inner_json_str.strip().removeprefix('```json').removesuffix('```').strip()
+                 # Decode and validate the nested payload in one pydantic-core pass,
+                 # without materialising an intermediate Python dict on success
                  try:
-                     inner_json_str_cleaned = inner_json_str.strip().removeprefix('```json').removesuffix('```').strip()
-                     response_json = json.loads(inner_json_str_cleaned)
-                 except json.JSONDecodeError as inner_jde:
-                      logger.error("Failed to parse nested JSON within 'response' field: %s. Inner string cleaned: %s", inner_jde, inner_json_str_cleaned[:500])
-                      raise LLMResponseFormatError(f"LLM nested JSON decode error: {inner_jde}") from inner_jde
+                     validated_data = response_model.model_validate_json(inner_json_str_cleaned)
+                 except ValidationError as inner_ve:
+                     if any(err.get("type") == "json_invalid" for err in inner_ve.errors()):
+                          logger.error("Failed to parse nested JSON within 'response' field: %s. Inner string cleaned: %s", inner_ve, inner_json_str_cleaned[:500])
+                          raise LLMResponseFormatError(f"LLM nested JSON decode error: {inner_ve}") from inner_ve
+                     response_json = loads_json(inner_json_str_cleaned)  # For the validation error report below
+                     raise
             else:
                  logger.warning("LLM response did not contain expected 'response' field with nested JSON. Attempting to parse outer structure directly.")
                  response_json = outer_json
 
-            # --- MODIFIED Validation Step ---
-            # Validate structure using the *passed* response_model type
-            validated_data = response_model(**response_json)
+                 # --- MODIFIED Validation Step ---
+                 # Validate structure using the *passed* response_model type
+                 validated_data = response_model.model_validate(response_json)
             logger.info("LLM response successfully parsed and validated against %s.", response_model.__name__)
             return validated_data
             # --- END MODIFICATION ---
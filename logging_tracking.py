@@ -49,9 +49,11 @@ class TaskFootprintLogger:
         snapshot: Dict[str, Any],
         hta_node: Optional[HTANode] = None,
         event_metadata: Optional[Dict[str, Any]] = None,
+        commit: bool = True,
     ):
         """
         Logs a task event with context extracted from the snapshot.
+        Pass ``commit=False`` to defer the write to the caller's next commit.
         """
         # Extract context
         capacity = snapshot.get("capacity")
@@ -76,7 +78,7 @@ class TaskFootprintLogger:
         }
 
         try:
-            self.repo.create_log(log_data)
+            self.repo.create_log(log_data, commit=commit)
             # Log HTA linking separately if provided
             if hta_node:
                 logger.info(
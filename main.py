@@ -9,11 +9,11 @@ from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 # Core components
-from forest_app.core.orchestrator import ForestOrchestrator, prune_context
+from forest_app.core.orchestrator import ForestOrchestrator, prune_context, splice_rebalanced_branch
 from forest_app.core.snapshot import MemorySnapshot
 
 # Persistence components
-from forest_app.persistence.database import get_db
+from forest_app.persistence.database import get_db, SessionLocal
 from forest_app.persistence.repository import MemorySnapshotRepository
 # --- ADDED: Import the missing SQLAlchemy model ---
 from forest_app.persistence.models import MemorySnapshotModel
@@ -112,6 +112,34 @@ def save_snapshot(repo: MemorySnapshotRepository, user_id: str, snapshot: Memory
     return new_or_updated_model
 
 
+def persist_rebalanced_hta(user_id: str):
+    """Builds the callback that stores a background HTA rebalance for ``user_id``.
+
+    Runs after the request's DB session is gone, so it opens its own, under the
+    orchestrator's per-user rebalance lock. The latest stored snapshot is re-read and
+    only the rebalanced branch is spliced into its HTA trees; node statuses already
+    stored there are kept, and everything outside the branch is left as stored.
+    """
+    def _persist(seed_id: str, branch: dict) -> None:
+        db = SessionLocal()
+        try:
+            repo = MemorySnapshotRepository(db)
+            stored = repo.get_latest_snapshot(user_id)
+            if not stored:
+                logger.warning("No stored snapshot for user %s; dropping rebalanced HTA.", user_id)
+                return
+            latest = MemorySnapshot.from_dict(stored.snapshot_data)
+            if not splice_rebalanced_branch(latest, seed_id, branch):
+                return
+            save_snapshot(repo, user_id, latest, stored)
+            logger.info("Persisted rebalanced HTA for user %s", user_id)
+        except Exception as e:
+            logger.exception("Failed to persist rebalanced HTA for user %s: %s", user_id, e)
+        finally:
+            db.close()
+    return _persist
+
+
 # --- Onboarding Endpoint 1: Set Goal ---
 @app.post("/onboarding/set_goal", response_model=OnboardingResponse)
 async def set_goal_endpoint(request: SetGoalRequest, db: Session = Depends(get_db)):
@@ -313,7 +341,7 @@ async def command_endpoint(request: CommandRequest, db: Session = Depends(get_db
         orchestrator._load_component_states(snapshot)
 
         reflection_id = str(uuid.uuid4())
-        result_dict = await orchestrator.process_reflection(request.command, snapshot)
+        result_dict = await orchestrator.process_reflection(request.command, snapshot, user_id=user_id)
 
         final_response = RichCommandResponse(**result_dict, onboarding_status="Completed")
         logger.info("Reflection processed for user %s", user_id)
@@ -377,8 +405,10 @@ async def complete_task_endpoint(
         # Note: Removed 'success' flag assuming orchestrator doesn't need it directly
         completion_result = await orchestrator.process_task_completion(
             task_id=request.task_id,
-            snapshot=snapshot,
-            db=db
+            snap=snapshot,
+            db=db,
+            on_rebalanced=persist_rebalanced_hta(user_id),
+            user_id=user_id,
         )
         logger.info("Processed completion for task %s (user %s)", request.task_id, user_id)
 
@@ -387,10 +417,11 @@ async def complete_task_endpoint(
         task_logger = TaskFootprintLogger(db)
         task_logger.log_task_event(
             task_id=request.task_id, event_type="completed",
-            snapshot=snapshot_dict, event_metadata={"success": request.success} # Log success from request
+            snapshot=snapshot_dict, event_metadata={"success": request.success}, # Log success from request
+            commit=False,
         )
 
-        # Persist updated snapshot using helper
+        # Persist updated snapshot using helper; this single commit also writes both event logs
         save_snapshot(repo, user_id, snapshot, stored)
         logger.info("Snapshot updated after completing task %s", request.task_id)
 
@@ -2,7 +2,7 @@
 
 import logging
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, Float, String, DateTime, JSON
+from sqlalchemy import Column, Integer, Float, String, DateTime, JSON, Index
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -23,6 +23,11 @@ class MemorySnapshotModel(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )  # Add updated_at
 
+    # get_latest_snapshot: WHERE user_id = ? ORDER BY updated_at DESC LIMIT 1 -> one index seek
+    __table_args__ = (
+        Index("ix_memory_snapshots_user_updated", user_id, updated_at.desc()),
+    )
+
     def __repr__(self):
         return f"<MemorySnapshotModel(id={self.id}, user_id={self.user_id}, updated_at={self.updated_at})>"
 
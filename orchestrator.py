@@ -12,11 +12,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import bisect
+import copy
+import hashlib
+import inspect
 import json
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any # Ensure List is imported
-
+import math
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Optional, Dict, Any, List
+
+from pydantic import BaseModel  # Needed by the HTAResponseModel import fallback below
 from sqlalchemy.orm import Session  # DB session for logging completions
 
 # ─────────────────────────────── Forest sub‑modules ──────────────────────────
@@ -34,11 +44,9 @@ from forest_app.modules.pattern_id import PatternIdentificationEngine
 from forest_app.modules.relational import RelationalManager
 from forest_app.modules.narrative_modes import NarrativeModesEngine
 from forest_app.modules.emotional_integrity import EmotionalIntegrityIndex
-from forest_app.modules.soft_deadline_manager import (
-    hours_until_deadline,
-    schedule_soft_deadlines,
-)
+from forest_app.modules.soft_deadline_manager import schedule_soft_deadlines
 from forest_app.modules.resistance_engine import clamp01
+from forest_app.core.utils import dumps_compact
 # --- ADDED: HTA Imports for Rebalancing ---
 # ---
 
@@ -98,15 +106,52 @@ except ImportError:
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Arbiter response cache: skip the LLM round-trip when the prompt inputs repeat.
+ARBITER_CACHE_MAX_ENTRIES = 2048
+# Task fields regenerated on every call (hash/timestamp based); excluded from the cache key.
+_VOLATILE_TASK_KEYS = ("id", "created_at")
+
+# Placeholder prompt - needs significant refinement!
+# Instruction preamble for HTA rebalancing. Identical on every call and kept ahead of
+# the per-call data so LLM backends with prefix caching can reuse it.
+HTA_REBALANCE_PROMPT_PREFIX = (
+    "[INST] You are an AI assistant that dynamically adapts a user's Hierarchical Task Analysis (HTA) plan based on their progress and context.\n"
+    "The user just completed the task linked to the HTA node identified below.\n\n"
+    "Instructions:\n"
+    "1. Analyze the impact of completing that node.\n"
+    "2. Re-evaluate the priorities, statuses (mark completed node, check parents), and relevance of remaining nodes, especially within the current level/branch.\n"
+    "3. **Serendipity:** Consider if this completion unlocks or suggests any unexpected but relevant new steps or exploration paths. If so, add them as new child nodes with a 'rationale'.\n"
+    "4. Prune any branches that are now clearly irrelevant due to this completion.\n"
+    "5. You are given only the branch containing that node (plus its ancestor chain for orientation). Return ONLY the updated branch, rooted at the same node id as the given 'branch', as a single valid JSON object adhering to the required schema (root key 'hta_root', nodes with id, title, description, priority, depends_on, children, etc.). Keep the ids of nodes you do not remove.\n\n"
+)
+
+# Lookup tables used on every reflection/completion; built once at import.
+_TIER_XP = {"Bud": 10, "Bloom": 20, "Blossom": 30}
+_TIER_DEV_MULT = {"Bud": 1.0, "Bloom": 1.5, "Blossom": 2.0}
+_IDLE_COEFF = {"structured": 0.025, "hybrid": 0.015, "open": 0.0}
+# Ascending cutoffs with parallel labels, for bisect lookup in describe_magnitude.
+_MAG_PAIRS = sorted(
+    ((float(v), k) for k, v in (MAGNITUDE_THRESHOLDS.items() if isinstance(MAGNITUDE_THRESHOLDS, dict) else ())
+     if isinstance(v, (int, float))),
+)
+_MAG_CUTOFFS = tuple(cutoff for cutoff, _ in _MAG_PAIRS)
+_MAG_LABELS = tuple(label for _, label in _MAG_PAIRS)
+del _MAG_PAIRS
+
 # ═════════════════════════════ Helper utilities ══════════════════════════════
 
 def award_task_xp(task: Dict[str, Any], shadow_score: float) -> int:
     """Return XP for a completed task (plus shadow bonus)."""
     tier = task.get("tier", "Bud")
-    base = {"Bud": 10, "Bloom": 20, "Blossom": 30}.get(tier, 10)
+    base = _TIER_XP.get(tier, 10)
     bonus = 5 if (tier != "Bud" and isinstance(shadow_score, (int, float)) and shadow_score > 0.7) else 0
     return base + bonus
 
+def _safe_float(obj, attr: str, default: float = 0.0) -> float:
+    """Numeric attribute of ``obj`` as a float, or ``default`` if missing/non-numeric."""
+    val = getattr(obj, attr, default)
+    return float(val) if isinstance(val, (int, float)) else float(default)
+
 def prune_context(snap_dict: Dict[str, Any]) -> Dict[str, Any]:
     """Minimise prompt size while keeping key info."""
     component_state = snap_dict.get("component_state") or {}
@@ -126,6 +171,133 @@ def prune_context(snap_dict: Dict[str, Any]) -> Dict[str, Any]:
     return ctx
 
 
+def _withering_core(idle_hours: float, idle_coeff: float, current: float) -> float:
+    """Numeric withering update: idle penalty, then decay. Plain float arithmetic."""
+    level = clamp01(current + idle_coeff * idle_hours)
+    return clamp01(level * 0.98)
+
+
+_DONE_STATUSES = ("completed", "pruned")
+
+
+def _hta_path(hta_tree: Dict[str, Any], node_id: str) -> List[Dict[str, Any]]:
+    """Returns the chain of node dicts from the root to ``node_id`` (empty if absent)."""
+    root = hta_tree.get("root") if isinstance(hta_tree, dict) else None
+    if not isinstance(root, dict):
+        return []
+    stack = [(root, (root,))]
+    while stack:
+        node, path = stack.pop()
+        if node.get("id") == node_id:
+            return list(path)
+        for child in node.get("children") or []:
+            if isinstance(child, dict):
+                stack.append((child, path + (child,)))
+    return []
+
+
+def _find_node_status(hta_tree: Dict[str, Any], node_id: str) -> Optional[str]:
+    """Status of ``node_id`` in the HTA dict ("" if unset), or None if the node is absent."""
+    path = _hta_path(hta_tree, node_id)
+    return str(path[-1].get("status") or "") if path else None
+
+
+def _mark_hta_node_completed(hta_tree: Dict[str, Any], node_id: str) -> bool:
+    """Marks ``node_id`` completed in a ``{"root": {...}}`` HTA dict, cascading to parents.
+
+    A parent is completed once every child is completed or pruned (same rule as
+    ``HTATree.propagate_status``). Returns False if the node isn't found.
+    """
+    path = _hta_path(hta_tree, node_id)
+    if not path:
+        return False
+    path[-1]["status"] = "completed"
+    for parent in reversed(path[:-1]):
+        children = [c for c in parent.get("children") or [] if isinstance(c, dict)]
+        if not all(str(c.get("status", "")).lower() in _DONE_STATUSES for c in children):
+            break
+        parent["status"] = "completed"
+    return True
+
+
+def _extract_relevant_subtree(hta_tree: Dict[str, Any], node_id: str) -> Optional[Dict[str, Any]]:
+    """Prompt view of the HTA around ``node_id``: the ancestor chain (id/title/status
+    only) plus the full branch under the node's parent, i.e. the node, its siblings
+    and their descendants. Returns None if the node isn't in the tree.
+    """
+    path = _hta_path(hta_tree, node_id)
+    if not path:
+        return None
+    branch = path[-2] if len(path) > 1 else path[-1]
+    ancestors = path[:-2]
+    return {
+        "ancestors": [
+            {"id": n.get("id"), "title": n.get("title"), "status": n.get("status")}
+            for n in ancestors
+        ],
+        "focus_node_id": node_id,
+        "branch": branch,
+    }
+
+
+def _splice_hta_branch(hta_tree: Dict[str, Any], branch: Dict[str, Any]) -> bool:
+    """Replaces the node whose id matches ``branch["id"]`` with ``branch`` in place.
+
+    Statuses recorded on the replaced subtree are copied onto same-id nodes of
+    ``branch`` (the LLM's node model carries no status), so completions survive.
+    """
+    path = _hta_path(hta_tree, branch.get("id"))
+    if not path:
+        return False
+    statuses = {}
+    stack = [path[-1]]
+    while stack:
+        node = stack.pop()
+        if node.get("status"):
+            statuses[node.get("id")] = node["status"]
+        stack.extend(c for c in node.get("children") or [] if isinstance(c, dict))
+    stack = [branch]
+    while stack:
+        node = stack.pop()
+        if node.get("id") in statuses:
+            node["status"] = statuses[node["id"]]
+        stack.extend(c for c in node.get("children") or [] if isinstance(c, dict))
+    if len(path) == 1:
+        hta_tree["root"] = branch
+        return True
+    siblings = path[-2].get("children") or []
+    for idx, child in enumerate(siblings):
+        if child is path[-1]:
+            siblings[idx] = branch
+            return True
+    return False
+
+
+def splice_rebalanced_branch(snap, seed_id: str, branch: Dict[str, Any]) -> bool:
+    """Splices a rebalanced ``branch`` into the HTA trees held by ``snap`` (the matching
+    seed's serialized tree and core_state's), leaving the rest of both trees as stored.
+
+    Meant for the latest persisted snapshot, so concurrent changes elsewhere in the
+    trees are kept. Returns False if the seed or the branch's node isn't found.
+    """
+    seed_state = snap.component_state.get("seed_manager")
+    seeds = seed_state.get("seeds", []) if isinstance(seed_state, dict) else []
+    seed_tree = next(
+        (d.get("hta_tree") for d in seeds if isinstance(d, dict) and d.get("seed_id") == seed_id),
+        None,
+    )
+    if not isinstance(seed_tree, dict):
+        logger.error("Seed %s not found in snapshot state while applying rebalanced HTA.", seed_id)
+        return False
+    if not _splice_hta_branch(seed_tree, copy.deepcopy(branch)):
+        logger.error("Rebalanced branch %s not found in seed %s's stored HTA tree.", branch.get("id"), seed_id)
+        return False
+    core_tree = snap.core_state.get("hta_tree")
+    if isinstance(core_tree, dict) and core_tree is not seed_tree:
+        _splice_hta_branch(core_tree, copy.deepcopy(branch))
+    return True
+
+
 def default_task_outcome() -> Dict[str, Any]:
     return {"completed": False, "effort": 0, "feedback": "No recent task outcome."}
 
@@ -156,9 +328,24 @@ class ForestOrchestrator:
         self.silent_scorer = SilentScoring()
         self.harmonic_router = HarmonicRouting() if HarmonicRouting else None
         self._saver = saver
+        self._saver_is_async = inspect.iscoroutinefunction(saver)
+        # Per-user locks serialising background saves; entries vanish once no save holds them.
+        self._save_locks: "weakref.WeakValueDictionary[Any, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._pending_saves: set = set()  # Strong refs so scheduled saves aren't GC'd mid-flight
+        self._arbiter_cache: "OrderedDict[bytes, tuple]" = OrderedDict()  # prompt digest -> (task, narrative)
+        # Per-user locks serialising background HTA rebalances; strong refs keep the tasks alive.
+        self._rebalance_locks: "weakref.WeakValueDictionary[Any, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._pending_rebalances: set = set()
         logger.info("ForestOrchestrator initialized with all engines.")
 
     # ───────────────────────── 2. COMPONENT‑STATE IO ─────────────────────────
+    @staticmethod
+    def _ensure_snap_defaults(snap) -> None:
+        """Repairs container fields that loaded data may have clobbered; run once per entry point."""
+        if not isinstance(snap.component_state, dict): snap.component_state = {}
+        if not isinstance(snap.task_backlog, list): snap.task_backlog = []
+        if not isinstance(snap.conversation_history, list): snap.conversation_history = []
+
     def _load_component_states(self, snap):
         """Safely loads state into each engine from the snapshot's component_state."""
         cs = snap.component_state if isinstance(snap.component_state, dict) else {}
@@ -174,9 +361,9 @@ class ForestOrchestrator:
             ("pattern_engine", self.pattern_engine, "pattern_engine_config"),
             ("narrative_engine", self.narrative_engine, "narrative_engine_config"),
             ("emotional_integrity", self.emotional_integrity_engine, "emotional_integrity_index"),
-            ("archetype_manager", getattr(snap, "archetype_manager", None), "archetype_manager"),
-            ("dev_index", getattr(snap, "dev_index", None), "dev_index"),
-            ("memory_system", getattr(snap, "memory_system", None), "memory_system"),
+            ("archetype_manager", snap.archetype_manager, "archetype_manager"),
+            ("dev_index", snap.dev_index, "dev_index"),
+            ("memory_system", snap.memory_system, "memory_system"),
         ]
         for name, engine, key in components_to_load:
              if engine and hasattr(engine, 'update_from_dict') and callable(engine.update_from_dict):
@@ -192,10 +379,14 @@ class ForestOrchestrator:
              elif key in cs:
                  logger.warning("State found for key '%s', but engine '%s' is missing or lacks update_from_dict.", key, name)
 
-    def _save_component_states(self, snap):
-        """Safely saves state from each engine into the snapshot's component_state."""
-        if not hasattr(snap, 'component_state') or not isinstance(snap.component_state, dict):
-            snap.component_state = {}
+    def _save_component_states(self, snap, persist: bool = True, user_id: Optional[str] = None):
+        """Safely saves state from each engine into the snapshot's component_state.
+
+        When ``persist`` is False the external saver is not invoked; callers are
+        expected to call ``_persist_snapshot`` themselves. ``user_id`` keys the
+        background save lock (see ``_schedule_save``).
+        """
+        self._ensure_snap_defaults(snap)
         cs = snap.component_state
         logger.debug("Saving component states into snapshot's component_state.")
         components_to_save = [
@@ -209,9 +400,9 @@ class ForestOrchestrator:
             ("pattern_engine_config", getattr(self, 'pattern_engine', None)),
             ("narrative_engine_config", getattr(self, 'narrative_engine', None)),
             ("emotional_integrity_index", getattr(self, 'emotional_integrity_engine', None)),
-            ("archetype_manager", getattr(snap, "archetype_manager", None)),
-            ("dev_index", getattr(snap, "dev_index", None)),
-            ("memory_system", getattr(snap, "memory_system", None)),
+            ("archetype_manager", snap.archetype_manager),
+            ("dev_index", snap.dev_index),
+            ("memory_system", snap.memory_system),
         ]
         for key, engine in components_to_save:
             # Ensure engine is not None before checking attributes
@@ -224,15 +415,71 @@ class ForestOrchestrator:
             elif engine: # Log if engine exists but lacks to_dict
                  logger.warning("Engine '%s' (key: %s) lacks a to_dict method.", type(engine).__name__, key)
 
-        snap.component_state = cs
-        if self._saver:
+        if persist:
+            self._persist_snapshot(snap, user_id)
+
+    def _persist_snapshot(self, snap, user_id: Optional[str] = None) -> None:
+        """Hands ``snap`` to the saver: coroutine savers in the background, sync ones inline."""
+        if not self._saver:
+            return
+        if self._saver_is_async:
+            self._schedule_save(snap, user_id)
+            return
+        # Sync savers (e.g. a request-scoped DB session) stay on the caller's thread
+        try:
+            logger.debug("Calling external saver callback.")
+            self._saver(snap)
+        except Exception as e:
+            logger.exception("Error in external saver callback: %s", e)
+
+    def _schedule_save(self, snap, user_id: Optional[str] = None) -> None:
+        """Fire-and-forget an async saver so the caller's response isn't blocked on I/O.
+
+        Saves for the same ``user_id`` run one at a time, in scheduling order. Without
+        a user id only saves of the same snapshot object are serialised.
+        """
+        if not self._saver:
+            return
+        # Detach the state here: the request keeps mutating ``snap`` after this returns.
+        state = copy.deepcopy(snap.to_dict())
+        key = user_id if user_id is not None else id(snap)
+        task = asyncio.create_task(self._async_save(type(snap), state, key))
+        self._pending_saves.add(task)
+        task.add_done_callback(self._pending_saves.discard)
+
+    async def _async_save(self, snap_cls, state: Dict[str, Any], key: Any) -> None:
+        """Runs the saver on a copy rebuilt from ``state``, under the per-user lock for ``key``."""
+        lock = self._save_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._save_locks[key] = lock
+        async with lock:
             try:
-                logger.debug("Calling external saver callback.")
-                self._saver(snap)
+                logger.debug("Calling external saver callback (background).")
+                await self._saver(snap_cls.from_dict(state))
             except Exception as e:
                 logger.exception("Error in external saver callback: %s", e)
 
     # ───────────────────────── 3. UTILITY HELPERS ────────────────────────────
+    @staticmethod
+    def _arbiter_cache_key(
+        user_input: str, history_text: str, context_json: str, base_task: Dict[str, Any], style: str
+    ) -> bytes:
+        """Digest of the reflection and everything the Arbiter prompt depends on, minus per-call task ids/timestamps."""
+        stable_task = {k: v for k, v in base_task.items() if k not in _VOLATILE_TASK_KEYS}
+        material = "\x1f".join((
+            str(user_input), history_text, context_json,
+            json.dumps(stable_task, sort_keys=True, default=str), style,
+        ))
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
+    def _remember_arbiter_response(self, key: bytes, task: Dict[str, Any], narrative: str) -> None:
+        """Stores a successful Arbiter response, evicting the least recently used entry when full."""
+        self._arbiter_cache[key] = (dict(task), narrative)
+        self._arbiter_cache.move_to_end(key)
+        if len(self._arbiter_cache) > ARBITER_CACHE_MAX_ENTRIES:
+            self._arbiter_cache.popitem(last=False)
+
     def get_primary_active_seed(self) -> Optional[Seed]:
         """Retrieves the first active seed from the loaded SeedManager state."""
         # Assumes _load_component_states was called, populating self.seed_manager
@@ -259,89 +506,63 @@ class ForestOrchestrator:
             return None
 
     # ───────────────────────── 4. WITHERING LOGIC ────────────────────────────
+    @staticmethod
+    def _legacy_last_activity(snap) -> float:
+        """Reads the pre-``last_activity_unix`` activity stamp from component_state (float or ISO string)."""
+        last_ts = snap.component_state.pop("last_activity_ts", None)
+        if isinstance(last_ts, (int, float)):
+             return float(last_ts)
+        if last_ts and isinstance(last_ts, str):
+             try:
+                 last_dt = datetime.fromisoformat(last_ts.replace("Z", "+00:00"))
+                 if last_dt.tzinfo is None: last_dt = last_dt.replace(tzinfo=timezone.utc)
+                 return last_dt.timestamp()
+             except ValueError: logger.warning("Could not parse last_activity_ts: %s", last_ts)
+        elif last_ts is not None: logger.warning("last_activity_ts has unexpected type: %s", type(last_ts))
+        return 0.0
+
     def _update_withering(self, snap) -> None:
         """Adjusts withering level based on inactivity and deadlines."""
-        if not hasattr(snap, 'withering_level'): snap.withering_level = 0.0
-        if not hasattr(snap, 'component_state') or not isinstance(snap.component_state, dict): snap.component_state = {}
-        if not hasattr(snap, 'task_backlog') or not isinstance(snap.task_backlog, list): snap.task_backlog = []
-        current_path = getattr(snap, "current_path", "structured")
-        now = datetime.utcnow()
-        last_iso = snap.component_state.get("last_activity_ts")
-        idle_hours = 0.0
-        if last_iso and isinstance(last_iso, str):
-             try:
-                 last_dt = datetime.fromisoformat(last_iso.replace("Z", "+00:00"))
-                 idle_hours = max(0.0,(now.replace(tzinfo=None) - last_dt.replace(tzinfo=None)).total_seconds() / 3600.0)
-             except ValueError: logger.warning("Could not parse last_activity_ts: %s", last_iso)
-        elif last_iso is not None: logger.warning("last_activity_ts is not a string: %s", type(last_iso))
-        idle_coeff = {"structured": 0.025,"hybrid": 0.015,"open": 0.0}.get(current_path, 0.025)
-        idle_penalty = idle_coeff * idle_hours
-        overdue_hours = 0.0
-        if current_path != "open":
-            overdue_list = []
-            if isinstance(snap.task_backlog, list):
-                 for task in snap.task_backlog:
-                     if isinstance(task, dict) and task.get("soft_deadline"):
-                         try:
-                              overdue = hours_until_deadline(task)
-                              if isinstance(overdue, (int, float)) and overdue < 0: overdue_list.append(abs(overdue))
-                         except Exception as e: logger.error("Error processing task deadline: %s - Task: %s", e, task.get('id', 'N/A'))
-            if overdue_list: overdue_hours = max(overdue_list)
-        soft_coeff = {"structured": 0.012,"hybrid": 0.005}.get(current_path, 0.0)
-        soft_penalty = soft_coeff * overdue_hours
-        current_withering = getattr(snap, 'withering_level', 0.0)
-        if not isinstance(current_withering, (int, float)): current_withering = 0.0
-        new_level = clamp01(float(current_withering) + idle_penalty + soft_penalty)
-        snap.withering_level = clamp01(new_level * 0.98)
+        self._ensure_snap_defaults(snap)
+        current_path = snap.current_path
+        now_ts = time.time()
+        last_ts = snap.last_activity_unix
+        if not last_ts:
+             last_ts = self._legacy_last_activity(snap)
+        idle_hours = max(0.0, (now_ts - last_ts) / 3600.0) if last_ts else 0.0
+        idle_coeff = _IDLE_COEFF.get(current_path, 0.025)
+        # No overdue-deadline term: the old per-task check went through hours_until_deadline,
+        # which clamps at zero, so the soft-deadline penalty never applied. Enabling it is a
+        # behaviour change, not part of this arithmetic.
+        snap.withering_level = _withering_core(idle_hours, idle_coeff, _safe_float(snap, "withering_level"))
         logger.debug("Updated withering level to: %.4f", snap.withering_level)
 
     # ───────────────────────── 5. REFLECTION WORKFLOW ───────────────────────
-    async def process_reflection(self, user_input: str, snap) -> Dict[str, Any]:
-        """Processes user reflection, updates state, generates task/narrative."""
-        logger.info("Processing reflection for user...")
-        if not hasattr(snap, 'component_state') or not isinstance(snap.component_state, dict): snap.component_state = {}
-        if not hasattr(snap, 'task_backlog') or not isinstance(snap.task_backlog, list): snap.task_backlog = []
-        if not hasattr(snap, 'conversation_history') or not isinstance(snap.conversation_history, list): snap.conversation_history = []
-
-        self._load_component_states(snap)
-        self._update_withering(snap)
-
-        # 1 – Sentiment Analysis
+    async def _analyze_sentiment(self, user_input: str, snap) -> Dict[str, Any]:
+        """Step 1: LLM sentiment analysis. Never raises; falls back to a neutral score."""
         sentiment_result = {"final_score": 0.0}
         try:
             if hasattr(self.sentiment_engine, 'analyze_emotional_field'):
                 logger.debug("Calling sentiment engine...")
-                # Ensure the correct response model is passed if analyze_emotional_field calls generate_response internally
-                # Assuming analyze_emotional_field was updated as discussed previously
                 sentiment_analysis_result = await self.sentiment_engine.analyze_emotional_field(
-                     user_input, snapshot=snap.to_dict() if hasattr(snap, 'to_dict') else {}
+                     user_input, snapshot=snap.to_dict()
                 )
                 if isinstance(sentiment_analysis_result, dict): sentiment_result = sentiment_analysis_result
                 else: logger.warning("Sentiment engine returned non-dict type: %s", type(sentiment_analysis_result))
             else: logger.error("Sentiment engine or analyze_emotional_field method missing.")
         except Exception as exc: logger.exception("Sentiment analysis step failed: %s", exc)
-        score = sentiment_result.get("final_score", 0.0)
-        if not isinstance(score, (int, float)): score = 0.0
-        logger.debug(f"Sentiment analysis score: {score}")
+        return sentiment_result
 
-        # 2 – Quick metric nudges based on sentiment
-        current_capacity = getattr(snap, 'capacity', 0.5); snap.capacity = clamp01(float(current_capacity) + 0.05 * score)
-        current_shadow = getattr(snap, 'shadow_score', 0.5); snap.shadow_score = clamp01(float(current_shadow) - 0.05 * score)
-        logger.debug(f"Metrics nudged: Capacity={snap.capacity:.2f}, Shadow={snap.shadow_score:.2f}")
+    def _generate_base_task(self, snap) -> Dict[str, Any]:
+        """Step 4: HTA-driven task selection. Never raises.
 
-        # 3 – Practical consequence update
-        try:
-             if hasattr(self.practical_consequence_engine, 'update_signals_from_reflection'):
-                 logger.debug("Calling practical consequence engine...")
-                 self.practical_consequence_engine.update_signals_from_reflection(user_input)
-             else: logger.error("Practical consequence engine or method missing.")
-        except Exception as exc: logger.exception("Practical consequence update step failed: %s", exc)
-
-        # 4 – Task generation
+        Must run on the event loop thread: it reads the orchestrator's shared engines
+        (seed manager, task engine), which other requests mutate.
+        """
         base_task = {"id": "fallback", "title": "Default Reflection Task", "magnitude": 5.0}
         try:
             logger.debug("Calling task engine...")
-            sdict = snap.to_dict() if hasattr(snap, 'to_dict') else {}
+            sdict = snap.to_dict()
             # Ensure HTA from active seed is put into sdict['core_state'] for task engine
             seed = self.get_primary_active_seed() # Uses self.seed_manager loaded from state
             if seed and hasattr(seed, 'hta_tree') and isinstance(seed.hta_tree, dict):
@@ -359,24 +580,63 @@ class ForestOrchestrator:
                      if isinstance(potential_task, dict):
                            potential_task.setdefault('magnitude', 5.0)
                            base_task = potential_task
-                           logger.debug(f"Task generated: {base_task.get('id')} - {base_task.get('title')}")
+                           if logger.isEnabledFor(logging.DEBUG):
+                               logger.debug("Task generated: %s - %s", base_task.get('id'), base_task.get('title'))
                      else: logger.error("task_engine returned invalid base_task format: %s", type(potential_task))
                 else: logger.error("task_engine returned invalid bundle format: %s", task_bundle)
             else: logger.error("Task engine or get_next_step method missing.")
         except Exception as exc: logger.exception("Task engine step failed: %s", exc)
+        return base_task
+
+    async def process_reflection(self, user_input: str, snap, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Processes user reflection, updates state, generates task/narrative.
+
+        ``user_id`` orders the background save against other saves for the same user.
+        """
+        logger.info("Processing reflection for user...")
+        self._ensure_snap_defaults(snap)
+
+        self._load_component_states(snap)
+        self._update_withering(snap)
+
+        # 3 – Practical consequence update (cheap keyword scan; runs inline)
+        try:
+             if hasattr(self.practical_consequence_engine, 'update_signals_from_reflection'):
+                 logger.debug("Calling practical consequence engine...")
+                 self.practical_consequence_engine.update_signals_from_reflection(user_input)
+             else: logger.error("Practical consequence engine or method missing.")
+        except Exception as exc: logger.exception("Practical consequence update step failed: %s", exc)
+
+        # 1 & 4 – Sentiment (LLM I/O) and task generation (CPU) are independent. Start the
+        # sentiment call and yield once so its request is in flight, then generate the task
+        # on the loop thread (no other coroutine can touch the shared engines meanwhile).
+        sentiment_task = asyncio.create_task(self._analyze_sentiment(user_input, snap))
+        await asyncio.sleep(0)
+        base_task = self._generate_base_task(snap)
+        sentiment_result = await sentiment_task
+        score = sentiment_result.get("final_score", 0.0)
+        if not isinstance(score, (int, float)): score = 0.0
+        logger.debug("Sentiment analysis score: %s", score)
+
+        # 2 – Quick metric nudges based on sentiment
+        snap.capacity = clamp01(float(snap.capacity) + 0.05 * score)
+        snap.shadow_score = clamp01(float(snap.shadow_score) - 0.05 * score)
+        logger.debug("Metrics nudged: Capacity=%.2f, Shadow=%.2f", snap.capacity, snap.shadow_score)
 
         # 5 – Narrative mode determination
+        # Snapshot is not mutated again before the Arbiter prompt, so one dict serves both
+        snap_dict = snap.to_dict()
         style = ""
         try:
              logger.debug("Determining narrative mode...")
              if hasattr(self.narrative_engine, 'determine_narrative_mode'):
                  nm = self.narrative_engine.determine_narrative_mode(
-                     snap.to_dict() if hasattr(snap, 'to_dict') else {},
+                     snap_dict,
                      context={"base_task": base_task}
                  )
                  if isinstance(nm, dict):
                       style = nm.get("style_directive", "")
-                      logger.debug(f"Narrative mode determined: {nm.get('mode', 'unknown')}")
+                      logger.debug("Narrative mode determined: %s", nm.get('mode', 'unknown'))
                  else: logger.error("Narrative engine returned invalid format: %s", nm)
              else: logger.error("Narrative engine or method missing.")
         except Exception as exc: logger.exception("Narrative mode step failed: %s", exc)
@@ -385,50 +645,61 @@ class ForestOrchestrator:
         conversation_history_text = ""
         history_limit = 6
         try:
-            if isinstance(snap.conversation_history, list):
-                recent_history = snap.conversation_history[-history_limit:]
-                if recent_history:
-                    formatted_history = [f"{turn.get('role', 'N/A').capitalize()}: {turn.get('content', '').strip()}"
-                                         for turn in recent_history if isinstance(turn, dict)]
-                    conversation_history_text = "\n".join(filter(None, formatted_history)) + "\n\n"
-                    logger.debug("Prepended conversation history to LLM prompt.")
+            recent_history = snap.conversation_history[-history_limit:]
+            if recent_history:
+                formatted_history = [f"{turn.get('role', 'N/A').capitalize()}: {turn.get('content', '').strip()}"
+                                     for turn in recent_history if isinstance(turn, dict)]
+                conversation_history_text = "\n".join(filter(None, formatted_history)) + "\n\n"
+                logger.debug("Prepended conversation history to LLM prompt.")
         except Exception as hist_exc: logger.exception("Error formatting conversation history: %s", hist_exc)
 
         # 6 – Arbiter LLM Call
         final_task, narrative = base_task, "(fallback: LLM call failed)"
 
+        context_json = json.dumps(prune_context(snap_dict))
         arb_prompt = (
             f"You are the Arbiter of The Forest—a poetic, deeply attuned guide. Your goal is to provide a short, evocative narrative response and potentially refine the suggested task.\n\n"
             f"Recent Conversation History:\n{conversation_history_text}"
-            f"Current Context Summary: {json.dumps(prune_context(snap.to_dict() if hasattr(snap, 'to_dict') else {}))}\n\n"
+            f"Current Context Summary: {context_json}\n\n"
             f"Suggested Task Blueprint: {json.dumps(base_task)}\n\n"
             f"Narrative Style Directive: {style if style else 'Default poetic style.'}\n\n"
             f"Instructions: Return ONLY a single valid JSON object with required keys 'task' (object, can be same as blueprint or refined) and 'narrative' (string response to user based on input, context, and history)."
         )
         logger.debug("Constructed Arbiter LLM prompt.")
 
-        try:
-            logger.debug("Calling Arbiter LLM...")
-            arb_out = await generate_response(arb_prompt, response_model=LLMResponseModel) # Use default model
-            if isinstance(arb_out, LLMResponseModel):
-                 potential_task = arb_out.task
-                 if isinstance(potential_task, dict): final_task = potential_task or base_task
-                 else: logger.warning("LLM returned invalid 'task' type (%s), using base task.", type(potential_task)); final_task = base_task
-                 potential_narrative = arb_out.narrative
-                 if isinstance(potential_narrative, str): narrative = potential_narrative
-                 else: logger.warning("LLM returned invalid 'narrative' type (%s), using fallback.", type(potential_narrative)); narrative = "(LLM response format error)"
-                 logger.info(">>> Successfully received narrative from LLM: %s", narrative[:100] + "...")
-            else:
-                 logger.error("generate_response returned unexpected type: %s", type(arb_out))
-                 narrative = "(Internal processing error after LLM call)"
-        except Exception as e:
-            logger.warning("LLM error during reflection processing: %s", e)
-            narrative = "(offline)"
-            logger.info(">>> Using fallback narrative: %s", narrative)
+        # The reflection is part of the key: different inputs must never share a cached narrative
+        arb_cache_key = self._arbiter_cache_key(user_input, conversation_history_text, context_json, base_task, style)
+        cached_arb = self._arbiter_cache.get(arb_cache_key)
+        if cached_arb is not None:
+            self._arbiter_cache.move_to_end(arb_cache_key)
+            cached_task, narrative = cached_arb
+            # Re-stamp the cached task with this call's fresh id/timestamp so backlog entries stay unique
+            final_task = {**cached_task, **{k: base_task[k] for k in _VOLATILE_TASK_KEYS if k in cached_task and k in base_task}}
+            logger.info("Arbiter inputs unchanged since a previous turn; reusing cached response.")
+        else:
+            try:
+                logger.debug("Calling Arbiter LLM...")
+                arb_out = await generate_response(arb_prompt, response_model=LLMResponseModel) # Use default model
+                if isinstance(arb_out, LLMResponseModel):
+                     potential_task = arb_out.task
+                     if isinstance(potential_task, dict): final_task = potential_task or base_task
+                     else: logger.warning("LLM returned invalid 'task' type (%s), using base task.", type(potential_task)); final_task = base_task
+                     potential_narrative = arb_out.narrative
+                     if isinstance(potential_narrative, str):
+                          narrative = potential_narrative
+                          self._remember_arbiter_response(arb_cache_key, final_task, narrative)
+                     else: logger.warning("LLM returned invalid 'narrative' type (%s), using fallback.", type(potential_narrative)); narrative = "(LLM response format error)"
+                     logger.info(">>> Successfully received narrative from LLM: %s", narrative[:100] + "...")
+                else:
+                     logger.error("generate_response returned unexpected type: %s", type(arb_out))
+                     narrative = "(Internal processing error after LLM call)"
+            except Exception as e:
+                logger.warning("LLM error during reflection processing: %s", e)
+                narrative = "(offline)"
+                logger.info(">>> Using fallback narrative: %s", narrative)
 
         # --- Append current turn to history ---
         try:
-            if not isinstance(snap.conversation_history, list): snap.conversation_history = []
             if isinstance(user_input, str): snap.conversation_history.append({"role": "user", "content": user_input})
             if isinstance(narrative, str): snap.conversation_history.append({"role": "assistant", "content": narrative})
             max_history = 20
@@ -437,8 +708,7 @@ class ForestOrchestrator:
         except Exception as hist_append_exc: logger.exception("Error appending to conversation history: %s", hist_append_exc)
 
         # 7 – Soft‑deadline scheduling
-        current_path = getattr(snap, "current_path", "structured")
-        if not hasattr(snap, 'task_backlog') or not isinstance(snap.task_backlog, list): snap.task_backlog = []
+        current_path = snap.current_path
         if current_path != "open":
             try:
                 if isinstance(final_task, dict):
@@ -452,16 +722,12 @@ class ForestOrchestrator:
         # --- Persist state *after* updating history AND potentially adding task ---
         # Add the generated task to the backlog *before* saving
         if isinstance(final_task, dict) and final_task.get("id"):
-             if isinstance(snap.task_backlog, list):
-                  snap.task_backlog.append(final_task)
-             else:
-                  logger.error("task_backlog is not a list, cannot append task.")
+             snap.task_backlog.append(final_task)
         else:
              logger.warning("No valid final_task generated to add to backlog.")
 
-        if not hasattr(snap, 'component_state') or not isinstance(snap.component_state, dict): snap.component_state = {}
-        snap.component_state["last_activity_ts"] = datetime.utcnow().isoformat()
-        self._save_component_states(snap) # Saves snapshot including conversation_history and updated task_backlog
+        snap.last_activity_unix = time.time()
+        self._save_component_states(snap, persist=False) # Persisted once the payload is built
 
         # Calculate final response fields
         task_magnitude = final_task.get('magnitude', 5.0)
@@ -473,10 +739,11 @@ class ForestOrchestrator:
             try:
                 logger.debug("Calculating harmonic routing...")
                 detailed_scores = {}
+                snap_dict = snap.to_dict()
                 if hasattr(self.silent_scorer, 'compute_detailed_scores'):
-                     detailed_scores = self.silent_scorer.compute_detailed_scores(snap.to_dict() if hasattr(snap, 'to_dict') else {})
+                     detailed_scores = self.silent_scorer.compute_detailed_scores(snap_dict)
                 harmonic_result = self.harmonic_router.route_harmony(
-                     snap.to_dict() if hasattr(snap, 'to_dict') else {},
+                     snap_dict,
                      detailed_scores if isinstance(detailed_scores, dict) else {}
                 )
                 if isinstance(harmonic_result, dict):
@@ -488,13 +755,14 @@ class ForestOrchestrator:
         response_payload = {
             "task": final_task if isinstance(final_task, dict) else {},
             "arbiter_response": narrative if isinstance(narrative, str) else "",
-            "withering": getattr(snap, 'withering_level', 0.0),
+            "withering": snap.withering_level,
             "magnitude_description": mag_desc if isinstance(mag_desc, str) else "Unknown",
             "resonance_theme": resonance_info.get("theme", "default"),
             "routing_score": resonance_info.get("routing_score", 0.0),
             "offering": None, # Placeholder
             "mastery_challenge": None, # Placeholder
         }
+        self._persist_snapshot(snap, user_id) # Saves snapshot including conversation_history and updated task_backlog
         logger.info(">>> Final narrative being returned in payload: %s", response_payload["arbiter_response"][:100] + "...")
         logger.info("Reflection processing complete.")
         return response_payload
@@ -507,21 +775,30 @@ class ForestOrchestrator:
         snap,
         db: Session,
         # success: bool = True # If using success flag passed from main.py
+        on_rebalanced: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+        user_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Processes task completion, updates snapshot, logs event, triggers HTA rebalancing."""
+        """Processes task completion, updates snapshot, logs event, triggers HTA rebalancing.
+
+        Rebalancing runs after this returns. ``on_rebalanced(seed_id, branch)`` (sync or
+        async) receives only the rebalanced branch and must merge it into the latest
+        stored state (see ``splice_rebalanced_branch``); it runs under the per-user
+        rebalance lock. Without it no rebalance is scheduled: re-saving this
+        request's snapshot later would overwrite newer state. ``user_id`` keys the
+        background save and rebalance locks.
+
+        The completion event is flushed to ``db`` but not committed; the caller's
+        snapshot save commits it in the same transaction.
+        """
         logger.info(f"Processing completion for task {task_id}...")
         # Basic state updates (XP, remove task, logs, etc.)
-        if not hasattr(snap, 'task_backlog') or not isinstance(snap.task_backlog, list): snap.task_backlog = []
-        if not hasattr(snap, 'xp'): snap.xp = 0
-        if not hasattr(snap, 'shadow_score'): snap.shadow_score = 0.5
-        if not hasattr(snap, 'withering_level'): snap.withering_level = 0.0
-        if not hasattr(snap, 'component_state') or not isinstance(snap.component_state, dict): snap.component_state = {}
+        self._ensure_snap_defaults(snap)
 
         # Find the completed task details *before* removing it
         task = next((t for t in snap.task_backlog if isinstance(t, dict) and t.get("id") == task_id), None)
         if not task:
             logger.warning("Task %s not found in backlog for completion.", task_id)
-            return {"error": f"Task {task_id} not found.", "xp_awarded": 0, "withering": getattr(snap, 'withering_level', 0.0)}
+            return {"error": f"Task {task_id} not found.", "xp_awarded": 0, "withering": snap.withering_level}
 
         # Get linked HTA node ID *before* removing task
         linked_hta_node_id = task.get("hta_node_id")
@@ -530,107 +807,144 @@ class ForestOrchestrator:
         snap.task_backlog = [t for t in snap.task_backlog if isinstance(t, dict) and t.get("id") != task_id]
 
         # Update XP, Dev Index, etc.
-        shadow_score_val = getattr(snap, 'shadow_score', 0.5)
-        if not isinstance(shadow_score_val, (int, float)): shadow_score_val = 0.5
-        xp_gain = award_task_xp(task, float(shadow_score_val))
+        xp_gain = award_task_xp(task, _safe_float(snap, "shadow_score", 0.5))
         logger.info(f"Awarding {xp_gain} XP for task {task_id}.")
-        current_xp = getattr(snap, 'xp', 0)
-        if not isinstance(current_xp, (int, float)): current_xp = 0
-        snap.xp = float(current_xp) + xp_gain
+        snap.xp = _safe_float(snap, "xp") + xp_gain
 
-        if hasattr(snap, "dev_index") and hasattr(snap.dev_index, 'apply_task_effect'):
+        if hasattr(snap.dev_index, 'apply_task_effect'):
             try:
-                 mult = {"Bud": 1.0, "Bloom": 1.5, "Blossom": 2.0}.get(task.get("tier", "Bud"), 1.0)
+                 mult = _TIER_DEV_MULT.get(task.get("tier", "Bud"), 1.0)
                  logger.debug("Applying dev index effect for task completion.")
                  snap.dev_index.apply_task_effect(task.get("relevant_indexes", []), mult, 1.0) # Assuming momentum = 1.0
             except Exception as dev_exc: logger.exception("Error applying dev_index task effect: %s", dev_exc)
 
+        # Serialised once for the event log and the rebalancing context; neither reads the
+        # fields changed below (withering, HTA statuses), so it stays valid for both.
+        snap_dict = snap.to_dict()
+
         # Log completion event
         try:
             if 'TaskFootprintLogger' in globals():
                  logger.debug("Logging task completion event to DB.")
                  TaskFootprintLogger(db).log_task_event(
                      task_id=task_id, event_type="completed",
-                     snapshot=snap.to_dict() if hasattr(snap, 'to_dict') else {},
+                     snapshot=snap_dict,
                      event_metadata={"xp_awarded": xp_gain, "success": True}, # Assuming success=True if this method is called
+                     commit=False, # Committed together with the caller's snapshot update
                  )
         except Exception as log_exc: logger.exception("Task footprint logging error on completion: %s", log_exc)
 
         # Update withering
-        current_withering = getattr(snap, 'withering_level', 0.0)
-        if not isinstance(current_withering, (int, float)): current_withering = 0.0
-        snap.withering_level = clamp01(float(current_withering) - 0.15)
-        logger.debug(f"Withering level reduced to: {snap.withering_level:.4f}")
+        snap.withering_level = clamp01(_safe_float(snap, "withering_level") - 0.15)
+        logger.debug("Withering level reduced to: %.4f", snap.withering_level)
 
-        # --- ADDED: HTA Rebalancing Logic ---
-        # Trigger rebalancing if the completed task was linked to an HTA node
+        # --- HTA Rebalancing: mark the node locally now, let the LLM rebalance in the background ---
         if linked_hta_node_id:
-            logger.info(f"Task completion linked to HTA node {linked_hta_node_id}. Triggering HTA rebalancing.")
+            logger.info("Task completion linked to HTA node %s. Scheduling HTA rebalancing.", linked_hta_node_id)
             try:
-                # 1. Get current HTA state from the active seed
                 active_seed = self.get_primary_active_seed() # Assumes SeedManager state is loaded
                 if not active_seed or not isinstance(active_seed.hta_tree, dict):
                     raise ValueError("Active seed or its HTA tree not found/valid for rebalancing.")
 
                 current_hta_dict = active_seed.hta_tree
-                # Optional: Mark the completed node status within the HTA dict before sending?
-                # This requires finding the node by ID and updating its status in the dict.
-                # Simpler: Just send the completed ID and let LLM handle status logic.
-
-                # 2. Construct Rebalancing Prompt
-                # Placeholder prompt - needs significant refinement!
-                hta_rebalancing_prompt = (
-                    f"[INST] You are an AI assistant that dynamically adapts a user's Hierarchical Task Analysis (HTA) plan based on their progress and context.\n"
-                    f"The user just completed the task linked to HTA node ID: '{linked_hta_node_id}'.\n"
-                    f"Their Current HTA Tree Structure:\n{json.dumps(current_hta_dict, indent=2)}\n\n"
-                    f"User Context Summary: {json.dumps(prune_context(snap.to_dict()))}\n"
-                    f"Current Level/Stage: {self.xp_mastery.get_current_stage(snap.xp)['stage']}\n\n" # Get current stage
-                    f"Instructions:\n"
-                    f"1. Analyze the impact of completing node '{linked_hta_node_id}'.\n"
-                    f"2. Re-evaluate the priorities, statuses (mark completed node, check parents), and relevance of remaining nodes, especially within the current level/branch.\n"
-                    f"3. **Serendipity:** Consider if this completion unlocks or suggests any unexpected but relevant new steps or exploration paths. If so, add them as new child nodes with a 'rationale'.\n"
-                    f"4. Prune any branches that are now clearly irrelevant due to this completion.\n"
-                    f"5. Return ONLY the complete, updated HTA tree structure as a single valid JSON object, adhering to the required schema (root key 'hta_root', nodes with id, title, description, priority, depends_on, children, etc.).\n"
-                    f"[/INST]"
-                )
-
-                # 3. Call LLM
-                logger.debug("Calling LLM for HTA rebalancing...")
-                rebalanced_hta_response = await generate_response(hta_rebalancing_prompt, response_model=HTAResponseModel)
-
-                # 4. Update Snapshot if successful
-                if hasattr(rebalanced_hta_response, 'hta_root') and isinstance(rebalanced_hta_response.hta_root, HTANodeModel):
-                    new_hta_dict = {"root": rebalanced_hta_response.hta_root.model_dump(mode='json')}
-                    active_seed.hta_tree = new_hta_dict # Update seed object in memory
-
-                    # Update SeedManager state in component_state
-                    if hasattr(self, 'seed_manager') and hasattr(self.seed_manager, 'update_seed'):
-                        self.seed_manager.update_seed(active_seed.seed_id, hta_tree=new_hta_dict)
-                        snap.component_state["seed_manager"] = self.seed_manager.to_dict()
-                    else:
-                        logger.error("Cannot update SeedManager state during HTA rebalancing.")
-
-                    # Update core_state for TaskEngine
-                    snap.core_state['hta_tree'] = new_hta_dict
-                    logger.info("Successfully rebalanced HTA tree after task completion.")
+                node_status = _find_node_status(current_hta_dict, linked_hta_node_id)
+                if node_status is None:
+                    logger.warning("HTA node %s not found in active seed tree; skipping rebalancing.", linked_hta_node_id)
+                elif node_status.lower() == "completed":
+                    # Already applied (e.g. a retried completion): nothing new for the LLM to react to
+                    logger.info("HTA node %s already completed; skipping rebalancing.", linked_hta_node_id)
                 else:
-                    logger.error("Failed to get valid rebalanced HTA structure from LLM.")
-                    # Continue without updating HTA
+                    _mark_hta_node_completed(current_hta_dict, linked_hta_node_id)
+                    snap.core_state['hta_tree'] = current_hta_dict
 
+                    if on_rebalanced is None:
+                        logger.info("No rebalance callback given; skipping HTA rebalancing.")
+                    else:
+                        # The prompt view is captured (and copied off the shared SeedManager's
+                        # tree) now, so it reflects state at completion time.
+                        hta_view = copy.deepcopy(_extract_relevant_subtree(current_hta_dict, linked_hta_node_id))
+                        task = asyncio.create_task(self._background_rebalance(
+                            active_seed.seed_id,
+                            hta_view,
+                            linked_hta_node_id,
+                            prune_context(snap_dict),
+                            self.xp_mastery.get_current_stage(snap.xp)['stage'],
+                            on_rebalanced,
+                            user_id,
+                        ))
+                        self._pending_rebalances.add(task)
+                        task.add_done_callback(self._pending_rebalances.discard)
             except Exception as rebal_err:
-                logger.exception("Error during HTA rebalancing after task completion: %s", rebal_err)
+                logger.exception("Error scheduling HTA rebalancing after task completion: %s", rebal_err)
                 # Do not re-raise, allow completion to succeed even if rebalancing fails
-        # --- END ADDED: HTA Rebalancing Logic ---
 
-        # Final state save *after* potential rebalancing
-        snap.component_state["last_activity_ts"] = datetime.utcnow().isoformat()
-        self._save_component_states(snap)
+        # Final state save (the LLM rebalance, if any, persists itself when it lands)
+        snap.last_activity_unix = time.time()
+        self._save_component_states(snap, user_id=user_id)
 
         logger.info(f"Task {task_id} completion processed successfully.")
         # Return original intended data
         return {"xp_awarded": xp_gain, "withering": snap.withering_level}
 
 
+    async def _background_rebalance(
+        self,
+        seed_id: str,
+        hta_view: Optional[Dict[str, Any]],
+        linked_hta_node_id: str,
+        context: Dict[str, Any],
+        stage: str,
+        on_rebalanced: Callable[[str, Dict[str, Any]], Any],
+        user_id: Optional[str] = None,
+    ) -> None:
+        """Asks the LLM to rebalance the completed node's branch and hands the new branch to ``on_rebalanced``.
+
+        ``hta_view`` is the ``_extract_relevant_subtree`` view, owned by this task.
+        """
+        key = user_id if user_id is not None else seed_id
+        lock = self._rebalance_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._rebalance_locks[key] = lock
+        async with lock:
+            try:
+                # Static instructions first so the backend can reuse the cached prefix;
+                # the HTA tree (mostly stable between completions) precedes the user context.
+                if hta_view is None:
+                    logger.error("HTA node %s not in tree; skipping rebalancing.", linked_hta_node_id)
+                    return
+                branch_id = hta_view["branch"].get("id")
+                hta_rebalancing_prompt = (
+                    f"{HTA_REBALANCE_PROMPT_PREFIX}"
+                    f"Completed HTA node ID: '{linked_hta_node_id}'\n"
+                    f"Relevant HTA Branch:\n{dumps_compact(hta_view)}\n\n"
+                    f"Current Level/Stage: {stage}\n"
+                    f"User Context Summary: {dumps_compact(context)}\n"
+                    f"[/INST]"
+                )
+
+                logger.debug("Calling LLM for HTA rebalancing...")
+                rebalanced_hta_response = await generate_response(hta_rebalancing_prompt, response_model=HTAResponseModel)
+                if not (hasattr(rebalanced_hta_response, 'hta_root') and isinstance(rebalanced_hta_response.hta_root, HTANodeModel)):
+                    logger.error("Failed to get valid rebalanced HTA structure from LLM.")
+                    return
+
+                new_branch = rebalanced_hta_response.hta_root.model_dump(mode='json')
+                if new_branch.get("id") != branch_id:
+                    logger.error("Rebalanced branch root %s does not match requested branch %s.", new_branch.get("id"), branch_id)
+                    return
+                logger.info("Received rebalanced HTA branch %s after task completion.", branch_id)
+
+                # Only the branch leaves this task: the callback splices it into the latest
+                # stored tree while the lock is held, so concurrent rebalances of other
+                # branches and newer saves are not reverted.
+                if inspect.iscoroutinefunction(on_rebalanced):
+                    await on_rebalanced(seed_id, new_branch)
+                else:
+                    await asyncio.to_thread(on_rebalanced, seed_id, new_branch)
+            except Exception as rebal_err:
+                logger.exception("Error during background HTA rebalancing: %s", rebal_err)
+
     # ───────────────────────── 7. CONVENIENCE APIS ──────────────────────────
     def plant_seed(
         self,
@@ -675,25 +989,18 @@ class ForestOrchestrator:
     @staticmethod
     def describe_magnitude(value: float) -> str:
         """Describes a magnitude value based on configured thresholds."""
-        if 'MAGNITUDE_THRESHOLDS' not in globals() or not isinstance(MAGNITUDE_THRESHOLDS, dict):
-             logger.error("MAGNITUDE_THRESHOLDS constant is missing or invalid for describe_magnitude.")
-             if value >= 9.0: return "Seismic"
-             if value >= 7.0: return "Profound"
-             if value >= 5.0: return "Rising"
-             if value >= 3.0: return "Subtle"
-             return "Dormant"
+        if not _MAG_CUTOFFS:
+             logger.error("MAGNITUDE_THRESHOLDS contains no valid numeric thresholds.")
+             return "Unknown"
         try:
              float_value = float(value)
-             valid_thresholds = {k: float(v) for k, v in MAGNITUDE_THRESHOLDS.items() if isinstance(v, (int, float))}
-             if not valid_thresholds:
-                  logger.error("MAGNITUDE_THRESHOLDS contains no valid numeric thresholds.")
-                  return "Unknown"
-             sorted_thresholds = sorted(valid_thresholds.items(), key=lambda item: item[1], reverse=True)
-             for label, thresh in sorted_thresholds:
-                 if float_value >= thresh: return label
-             return sorted_thresholds[-1][0] if float_value > 0 else "Dormant"
-        except Exception as e:
+        except (TypeError, ValueError) as e:
              logger.exception("Error describing magnitude for value %s: %s", value, e)
              return "Unknown"
+        # bisect would place NaN past every cutoff; the threshold scan never matched it
+        if math.isnan(float_value): return "Dormant"
+        idx = bisect.bisect_right(_MAG_CUTOFFS, float_value) - 1
+        if idx >= 0: return _MAG_LABELS[idx]
+        return _MAG_LABELS[0] if float_value > 0 else "Dormant"
 
 # ═════════════════════════════════════════════════════════════════════════════
\ No newline at end of file
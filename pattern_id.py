@@ -1,9 +1,15 @@
 # forest_app/modules/pattern_id.py
 
+import copy
+import hashlib
+import itertools
 import logging
 import re
-from typing import List, Dict, Any, Optional
-from collections import Counter, defaultdict
+from typing import ClassVar, List, Dict, Any, Optional, Tuple
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+from forest_app.core.utils import dumps_compact
 
 # Consider adding stop-word list or using a library if available later
 # from nltk.corpus import stopwords # Example
@@ -13,6 +19,73 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+# Basic stop words (consider expanding or using a library); built once at import.
+_DEFAULT_STOP_WORDS = frozenset(
+    (
+        "a", "an", "the", "in", "on", "at", "to", "for", "of", "it",
+        "is", "was", "am", "are", "i", "me", "my", "myself", "we", "our",
+        "ours", "ourselves", "you", "your", "yours", "yourself", "yourselves", "he", "him", "his",
+        "himself", "she", "her", "hers", "herself", "its", "itself", "they", "them", "their",
+        "theirs", "themselves", "what", "which", "who", "whom", "this", "that", "these", "those",
+        "were", "be", "been", "being", "have", "has", "had", "having", "do", "does",
+        "did", "doing", "and", "but", "if", "or", "because", "as", "until", "while",
+        "by", "with", "about", "against", "between", "into", "through", "during", "before", "after",
+        "above", "below", "from", "up", "down", "out", "off", "over", "under", "again",
+        "further", "then", "once", "here", "there", "when", "where", "why", "how", "all",
+        "any", "both", "each", "few", "more", "most", "other", "some", "such", "no",
+        "nor", "not", "only", "own", "same", "so", "than", "too", "very", "s",
+        "t", "can", "will", "just", "don", "should", "now", "d", "ll", "m",
+        "o", "re", "ve", "y", "ain", "aren", "couldn", "didn", "doesn", "hadn",
+        "hasn", "haven", "isn", "ma", "mightn", "mustn", "needn", "shan", "shouldn", "wasn",
+        "weren", "won", "wouldn", "feel", "think", "get", "go", "make", "know", "try",
+        "really", "want", "need", "like", "day", "time", "work", "going", "still", "even",
+        "much", "bit", "today", "yesterday", "week",
+    )
+)
+
+# Keywords correlated with current metrics in the potential-trigger heuristics.
+_STRESS_KEYWORDS = frozenset(
+    ("deadline", "conflict", "argument", "pressure", "overwhelm", "anxiety", "stress", "failure")
+)
+_FATIGUE_KEYWORDS = frozenset(("tired", "exhausted", "burnout", "drained", "overwhelmed"))
+# Task statuses that count towards a potential task cycle.
+_CYCLE_STATUSES = frozenset(("skipped", "failed"))
+
+
+# Reflection texts whose keyword lists are memoized across analyze_snapshot calls.
+KEYWORD_CACHE_SIZE = 4096
+# Recent analyze_snapshot results kept per engine, keyed by a digest of the inputs read.
+ANALYSIS_CACHE_SIZE = 8
+_WORD_RE = re.compile(r"\b\w{3,}\b")  # Words of 3+ chars
+
+
+def _count_keywords(text: str, num_keywords: int, stop_words) -> Tuple[str, ...]:
+    """Most frequent non-stop-words in ``text``, as an immutable tuple.
+
+    Stop words are filtered in Python on purpose: folding them into the pattern as
+    a negative-lookahead alternation makes CPython's backtracking ``re`` test every
+    stop word at every word boundary, ~3x slower than findall plus a frozenset check.
+    """
+    word_counts = Counter(
+        word for word in _WORD_RE.findall(text.lower()) if word not in stop_words
+    )
+    # Return the most common keywords meeting a minimum count maybe?
+    return tuple(word for word, count in word_counts.most_common(num_keywords))
+
+
+# frozenset caches its own hash, so the stop-word argument adds no per-call cost
+_cached_keywords = lru_cache(maxsize=KEYWORD_CACHE_SIZE)(_count_keywords)
+
+
+def _tail(items, n: int) -> List[Any]:
+    """Last ``n`` items of a list, tuple or deque as a list (empty when ``n`` <= 0)."""
+    if n <= 0:
+        return []
+    if isinstance(items, list):
+        return items[-n:]
+    return list(itertools.islice(items, max(0, len(items) - n), None))
+
+
 class PatternIdentificationEngine:
     """
     Analyzes historical snapshot data to identify recurring patterns, cycles,
@@ -25,6 +98,8 @@ class PatternIdentificationEngine:
       keywords with current snapshot metrics.
     """
 
+    _WORD_RE: ClassVar[re.Pattern] = _WORD_RE
+
     def __init__(self, config: Optional[Dict] = None):
         """
         Initializes the engine. Config includes thresholds and lookback windows.
@@ -37,215 +112,31 @@ class PatternIdentificationEngine:
             "min_task_cycle_occurrence": 3,
             "high_shadow_threshold": 0.7,
             "low_capacity_threshold": 0.3,
-            # Add more config like stop words, common task title patterns etc.
+            # Optional "extra_stop_words": list of additional words to ignore
+            # Add more config like common task title patterns etc.
         }
-        # Basic stop words (consider expanding or using a library)
-        self.stop_words = set(
-            [
-                "a",
-                "an",
-                "the",
-                "in",
-                "on",
-                "at",
-                "to",
-                "for",
-                "of",
-                "it",
-                "is",
-                "was",
-                "am",
-                "are",
-                "i",
-                "me",
-                "my",
-                "myself",
-                "we",
-                "our",
-                "ours",
-                "ourselves",
-                "you",
-                "your",
-                "yours",
-                "yourself",
-                "yourselves",
-                "he",
-                "him",
-                "his",
-                "himself",
-                "she",
-                "her",
-                "hers",
-                "herself",
-                "it",
-                "its",
-                "itself",
-                "they",
-                "them",
-                "their",
-                "theirs",
-                "themselves",
-                "what",
-                "which",
-                "who",
-                "whom",
-                "this",
-                "that",
-                "these",
-                "those",
-                "am",
-                "is",
-                "are",
-                "was",
-                "were",
-                "be",
-                "been",
-                "being",
-                "have",
-                "has",
-                "had",
-                "having",
-                "do",
-                "does",
-                "did",
-                "doing",
-                "a",
-                "an",
-                "the",
-                "and",
-                "but",
-                "if",
-                "or",
-                "because",
-                "as",
-                "until",
-                "while",
-                "of",
-                "at",
-                "by",
-                "for",
-                "with",
-                "about",
-                "against",
-                "between",
-                "into",
-                "through",
-                "during",
-                "before",
-                "after",
-                "above",
-                "below",
-                "to",
-                "from",
-                "up",
-                "down",
-                "in",
-                "out",
-                "on",
-                "off",
-                "over",
-                "under",
-                "again",
-                "further",
-                "then",
-                "once",
-                "here",
-                "there",
-                "when",
-                "where",
-                "why",
-                "how",
-                "all",
-                "any",
-                "both",
-                "each",
-                "few",
-                "more",
-                "most",
-                "other",
-                "some",
-                "such",
-                "no",
-                "nor",
-                "not",
-                "only",
-                "own",
-                "same",
-                "so",
-                "than",
-                "too",
-                "very",
-                "s",
-                "t",
-                "can",
-                "will",
-                "just",
-                "don",
-                "should",
-                "now",
-                "d",
-                "ll",
-                "m",
-                "o",
-                "re",
-                "ve",
-                "y",
-                "ain",
-                "aren",
-                "couldn",
-                "didn",
-                "doesn",
-                "hadn",
-                "hasn",
-                "haven",
-                "isn",
-                "ma",
-                "mightn",
-                "mustn",
-                "needn",
-                "shan",
-                "shouldn",
-                "wasn",
-                "weren",
-                "won",
-                "wouldn",
-                "feel",
-                "think",
-                "get",
-                "go",
-                "make",
-                "know",
-                "try",
-                "really",
-                "want",
-                "need",
-                "like",
-                "day",
-                "time",
-                "work",
-                "going",
-                "still",
-                "even",
-                "much",
-                "bit",
-                "today",
-                "yesterday",
-                "week",
-            ]
-        )
+        self.stop_words = self._build_stop_words()
+        self._analysis_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
         logger.info(
             "PatternIdentificationEngine initialized with config: %s", self.config
         )
 
+    def _build_stop_words(self) -> frozenset:
+        """Shared default stop words, extended by config["extra_stop_words"] if given."""
+        extra = self.config.get("extra_stop_words")
+        if not extra:
+            return _DEFAULT_STOP_WORDS  # Same object for every engine; no per-instance copy
+        return _DEFAULT_STOP_WORDS.union(str(w).lower() for w in extra)
+
     def _extract_keywords(self, text: str, num_keywords: int = 7) -> List[str]:
         """Extracts keywords based on frequency, excluding stop words and short words."""
         if not isinstance(text, str):
             return []
-        words = re.findall(r"\b\w{3,}\b", text.lower())  # Find words of 3+ chars
-        filtered_words = [word for word in words if word not in self.stop_words]
-        word_counts = Counter(filtered_words)
-        # Return the most common keywords meeting a minimum count maybe?
-        return [word for word, count in word_counts.most_common(num_keywords)]
+        stop_words = self.stop_words
+        if isinstance(stop_words, frozenset):
+            # Reflections don't change once logged; tokenize each one only once
+            return list(_cached_keywords(text, num_keywords, stop_words))
+        return list(_count_keywords(text, num_keywords, stop_words))
 
     def analyze_snapshot(self, snapshot_dict: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -260,30 +151,53 @@ class PatternIdentificationEngine:
         Returns:
             Dictionary summarizing detected patterns.
         """
-        logger.info("Starting pattern analysis on snapshot.")
         detected_patterns = {
             "recurring_reflection_keywords": [],
             "recurring_keyword_pairs": [],
             "potential_task_cycles": [],
             "potential_triggers": [],
         }
+        reflection_log = snapshot_dict.get("reflection_log") or []
+        task_backlog = snapshot_dict.get("task_backlog") or []
+        # Nothing to analyze yet (e.g. freshly planted seed): every section would come back empty
+        if not reflection_log and not task_backlog:
+            logger.debug("Pattern analysis skipped: no reflections or tasks in snapshot.")
+            return detected_patterns
+
+        # Only the lookback windows are ever read; take each tail once (O(lookback)
+        # copies, independent of total log length) and share it with the cache key.
+        recent_reflections = _tail(reflection_log, self.config["reflection_lookback"])
+        recent_task_window = _tail(task_backlog, self.config["task_lookback"])
+
+        # A snapshot the key can't be built from is still analysed, just uncached
+        try:
+            cache_key = self._analysis_key(snapshot_dict, recent_reflections, recent_task_window)
+        except Exception as e:
+            logger.warning("Could not build pattern analysis cache key; analysing uncached: %s", e)
+            cache_key = None
+        cached = self._analysis_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            logger.debug("Pattern analysis served from cache.")
+            return copy.deepcopy(cached)
+
+        logger.info("Starting pattern analysis on snapshot.")
         all_keywords_flat = []  # Store all keywords for trigger analysis later
 
         # --- 1. Analyze Reflection Log ---
         try:
-            reflection_log = snapshot_dict.get("reflection_log", [])
-            recent_reflections = reflection_log[-self.config["reflection_lookback"] :]
-            recent_reflection_keywords_sets = [
-                set(self._extract_keywords(entry.get("input", ""), num_keywords=10))
-                for entry in recent_reflections
-                if entry.get("input")
-            ]
+            # One pass builds both views. Keywords are de-duplicated per reflection,
+            # so counts below mean "number of reflections mentioning the keyword".
+            recent_reflection_keywords_sets = []
+            for entry in recent_reflections:
+                text = entry.get("input")
+                if text:
+                    kw_set = set(self._extract_keywords(text, num_keywords=10))
+                    recent_reflection_keywords_sets.append(kw_set)
+                    all_keywords_flat.extend(kw_set)
 
             if recent_reflection_keywords_sets:
                 # Find recurring individual keywords
-                all_keywords_flat = [
-                    kw for kw_set in recent_reflection_keywords_sets for kw in kw_set
-                ]
                 keyword_counts = Counter(all_keywords_flat)
                 min_occurrence = self.config["min_keyword_occurrence"]
                 recurring_kws = [
@@ -303,14 +217,9 @@ class PatternIdentificationEngine:
                 # Find recurring co-occurring keyword pairs
                 pair_counts = Counter()
                 for kw_set in recent_reflection_keywords_sets:
-                    # Create sorted pairs to count ('a','b') the same as ('b','a')
-                    # Ensure kw1 != kw2 implicitly by list slicing start index
-                    pairs = {
-                        tuple(sorted((kw1, kw2)))
-                        for i, kw1 in enumerate(list(kw_set))
-                        for kw2 in list(kw_set)[i + 1 :]
-                    }
-                    pair_counts.update(pairs)
+                    # Combinations of a sorted set are already canonical ('a','b')
+                    # pairs, so ('b','a') is never produced separately.
+                    pair_counts.update(itertools.combinations(sorted(kw_set), 2))
 
                 min_cooccurrence = self.config["min_cooccurrence"]
                 # Sort pairs for consistent output
@@ -338,19 +247,22 @@ class PatternIdentificationEngine:
 
         # --- 2. Analyze Task Backlog/History for Cycles ---
         try:
-            task_backlog = snapshot_dict.get("task_backlog", [])
             # Ensure tasks are dictionaries before proceeding
             recent_tasks = [
                 task
-                for task in task_backlog[-self.config["task_lookback"] :]
+                for task in recent_task_window
                 if isinstance(task, dict)
             ]
 
-            task_patterns = defaultdict(
-                lambda: {"skipped": 0, "failed": 0, "overdue": 0, "count": 0}
-            )
-
+            # Single pass collecting the group key of every skipped/failed/overdue task
+            skipped_keys, failed_keys, overdue_keys = [], [], []
             for task in recent_tasks:
+                status_lower = task.get("status", "").lower()
+                # Check overdue flag set by orchestrator's deadline monitoring
+                overdue = task.get("overdue", False)
+                if not overdue and status_lower not in _CYCLE_STATUSES:
+                    continue  # Most tasks are pending/completed: no key needed
+
                 # Prioritize HTA Node ID for grouping, fallback to theme
                 hta_node_id = task.get(
                     "linked_hta_node_id"
@@ -360,33 +272,28 @@ class PatternIdentificationEngine:
                     if hta_node_id
                     else f"theme:{task.get('theme', 'Unknown').lower()}"
                 )
-                task_patterns[key]["count"] += 1
 
-                status_lower = task.get("status", "").lower()
                 if status_lower == "skipped":
-                    task_patterns[key]["skipped"] += 1
+                    skipped_keys.append(key)
                 elif status_lower == "failed":  # Assuming 'failed' status exists
-                    task_patterns[key]["failed"] += 1
-
-                # Check overdue flag set by orchestrator's deadline monitoring
-                if task.get("overdue", False):
-                    task_patterns[key]["overdue"] += 1
+                    failed_keys.append(key)
+                if overdue:
+                    overdue_keys.append(key)
 
             min_cycle = self.config["min_task_cycle_occurrence"]
-            for key, counts in task_patterns.items():
-                # Flag if a significant portion of tasks for a key are skipped/failed/overdue
-                if counts["skipped"] >= min_cycle:
-                    detected_patterns["potential_task_cycles"].append(
-                        {"pattern": f"Skipped {key}", "count": counts["skipped"]}
-                    )
-                if counts["failed"] >= min_cycle:
-                    detected_patterns["potential_task_cycles"].append(
-                        {"pattern": f"Failed {key}", "count": counts["failed"]}
-                    )
-                if counts["overdue"] >= min_cycle:
-                    detected_patterns["potential_task_cycles"].append(
-                        {"pattern": f"Overdue {key}", "count": counts["overdue"]}
-                    )
+            # Flag if a significant portion of tasks for a key are skipped/failed/overdue
+            for label, flagged_keys in (
+                ("Skipped", skipped_keys),
+                ("Failed", failed_keys),
+                ("Overdue", overdue_keys),
+            ):
+                if len(flagged_keys) < min_cycle:
+                    continue
+                for key, count in Counter(flagged_keys).items():
+                    if count >= min_cycle:
+                        detected_patterns["potential_task_cycles"].append(
+                            {"pattern": f"{label} {key}", "count": count}
+                        )
 
             # Sort for consistency
             detected_patterns["potential_task_cycles"].sort(
@@ -415,17 +322,7 @@ class PatternIdentificationEngine:
 
             # Example: High shadow potentially linked to recurring stressor keywords
             if shadow_score > high_shadow_threshold:
-                stress_keywords = {
-                    "deadline",
-                    "conflict",
-                    "argument",
-                    "pressure",
-                    "overwhelm",
-                    "anxiety",
-                    "stress",
-                    "failure",
-                }
-                found_stressors = recent_keywords_flat_set.intersection(stress_keywords)
+                found_stressors = recent_keywords_flat_set.intersection(_STRESS_KEYWORDS)
                 if found_stressors:
                     detected_patterns["potential_triggers"].append(
                         f"High shadow ({shadow_score:.2f}) potentially linked to recent mentions of: {sorted(list(found_stressors))}"
@@ -433,14 +330,7 @@ class PatternIdentificationEngine:
 
             # Example: Low capacity potentially linked to recurring fatigue keywords
             if capacity < low_capacity_threshold:
-                fatigue_keywords = {
-                    "tired",
-                    "exhausted",
-                    "burnout",
-                    "drained",
-                    "overwhelmed",
-                }
-                found_fatigue = recent_keywords_flat_set.intersection(fatigue_keywords)
+                found_fatigue = recent_keywords_flat_set.intersection(_FATIGUE_KEYWORDS)
                 if found_fatigue:
                     detected_patterns["potential_triggers"].append(
                         f"Low capacity ({capacity:.2f}) potentially linked to recent mentions of: {sorted(list(found_fatigue))}"
@@ -477,8 +367,30 @@ class PatternIdentificationEngine:
         logger.info(
             "Pattern analysis complete. Detected patterns: %s", detected_patterns
         )
+        if cache_key is not None:
+            self._analysis_cache[cache_key] = copy.deepcopy(detected_patterns)
+            if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
         return detected_patterns
 
+    def _analysis_key(
+        self,
+        snapshot_dict: Dict[str, Any],
+        recent_reflections: List[Any],
+        recent_task_window: List[Any],
+    ) -> bytes:
+        """Digest of everything analyze_snapshot reads: config, lookback windows, gauges."""
+        payload = [
+            self.config,
+            recent_reflections,
+            recent_task_window,
+            snapshot_dict.get("shadow_score", 0.5),
+            snapshot_dict.get("capacity", 0.5),
+        ]
+        return hashlib.blake2b(
+            dumps_compact(payload, sort_keys=True).encode(), digest_size=16
+        ).digest()
+
     def to_dict(self) -> dict:
         """Serializes the engine's configuration."""
         return {"config": self.config}
@@ -490,6 +402,8 @@ class PatternIdentificationEngine:
             if isinstance(config_update, dict):
                 # Use update for nested dicts if necessary, or just replace
                 self.config.update(config_update)
+                self.stop_words = self._build_stop_words()
+                self._analysis_cache.clear()
             else:
                 logger.warning(
                     "Invalid format for config update in PatternIdentificationEngine."
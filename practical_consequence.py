@@ -1,11 +1,82 @@
 # forest_app/modules/practical_consequence.py
 
 import logging
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# (trigger substrings, signal bucket, adjustment) heuristics for reflections.
+_SIGNAL_RULES = (
+    (frozenset(("rush", "deadline")), "time", 0.1),
+    (frozenset(("delay", "waiting")), "time", -0.05),
+    (frozenset(("tired", "exhausted")), "energy", 0.1),
+    (frozenset(("energized", "motivated")), "energy", -0.05),
+    (frozenset(("money", "debt")), "money", 0.1),
+    (frozenset(("affluent", "wealth")), "money", -0.05),
+    (frozenset(("lonely", "isolated", "argument")), "relational", 0.1),
+    (frozenset(("supported", "connected")), "relational", -0.05),
+    (frozenset(("unsafe", "fear")), "safety", 0.1),
+    (frozenset(("secure", "protected")), "safety", -0.05),
+)
+# Substring (not whole-word) matching, like the original `kw in text` checks.
+# Longest first so a keyword is never shadowed by a shorter one at the same position.
+_SIGNAL_RE = re.compile(
+    "|".join(sorted((kw for kws, _, _ in _SIGNAL_RULES for kw in kws), key=len, reverse=True))
+)
+
+# Adjustment buckets, in the order their weighted contributions are summed.
+_BUCKETS = ("time", "energy", "money", "relational", "safety")
+
+_DEFAULT_CALIBRATION = {
+    "base_weight": 1.0,
+    "time_weight": 0.25,
+    "energy_weight": 0.25,
+    "money_weight": 0.20,
+    "relational_weight": 0.15,
+    "safety_weight": 0.15,
+}
+
+
+def _reflection_adjustments(reflection_lower: str) -> Optional[Dict[str, float]]:
+    """Per-bucket adjustments triggered by a lowercased reflection, or None if nothing fires."""
+    # One regex pass finds every trigger substring present,
+    # then each rule fires at most once, as the chained `in` checks did.
+    hits = set(_SIGNAL_RE.findall(reflection_lower))
+    if not hits:
+        return None
+    adjustments = dict.fromkeys(_BUCKETS, 0.0)
+    for keywords, bucket, delta in _SIGNAL_RULES:
+        if not hits.isdisjoint(keywords):
+            adjustments[bucket] += delta
+    return adjustments
+
+
+def batch_update_scores(
+    scores: Iterable[float], reflections: Iterable[str], calibration: Optional[dict] = None
+) -> List[float]:
+    """
+    Applies update_signals_from_reflection's scoring to many (score, reflection)
+    pairs at once, e.g. for analytics over stored snapshots. Weights are read
+    once per batch; results match the per-engine method.
+    """
+    cal = calibration or _DEFAULT_CALIBRATION
+    weights = tuple(cal[f"{b}_weight"] for b in _BUCKETS)
+    base = cal["base_weight"]
+    out = []
+    for score, reflection in zip(scores, reflections):
+        adj = _reflection_adjustments(reflection.lower())
+        if adj is not None:
+            total = 0.0
+            for weight, bucket in zip(weights, _BUCKETS):
+                total += weight * adj[bucket]
+            score = max(0.0, min(1.0, score + base * total))
+        out.append(score)
+    return out
+
 
 class PracticalConsequenceEngine:
     """
@@ -14,51 +85,16 @@ class PracticalConsequenceEngine:
     """
 
     def __init__(self, calibration=None):
-        self.calibration = calibration or {
-            "base_weight": 1.0,
-            "time_weight": 0.25,
-            "energy_weight": 0.25,
-            "money_weight": 0.20,
-            "relational_weight": 0.15,
-            "safety_weight": 0.15,
-        }
-        self.last_update = datetime.utcnow().isoformat()
+        self.calibration = calibration or dict(_DEFAULT_CALIBRATION)
+        self.last_update = time.time()  # Unix seconds; rendered as ISO only in to_dict
         self.score = 0.5
 
     def update_signals_from_reflection(self, reflection: str):
-        reflection_lower = reflection.lower()
-        adjustments = {
-            "time": 0.0,
-            "energy": 0.0,
-            "money": 0.0,
-            "relational": 0.0,
-            "safety": 0.0,
-        }
-        # Example heuristics
-        if "rush" in reflection_lower or "deadline" in reflection_lower:
-            adjustments["time"] += 0.1
-        if "delay" in reflection_lower or "waiting" in reflection_lower:
-            adjustments["time"] -= 0.05
-        if "tired" in reflection_lower or "exhausted" in reflection_lower:
-            adjustments["energy"] += 0.1
-        if "energized" in reflection_lower or "motivated" in reflection_lower:
-            adjustments["energy"] -= 0.05
-        if "money" in reflection_lower or "debt" in reflection_lower:
-            adjustments["money"] += 0.1
-        if "affluent" in reflection_lower or "wealth" in reflection_lower:
-            adjustments["money"] -= 0.05
-        if (
-            "lonely" in reflection_lower
-            or "isolated" in reflection_lower
-            or "argument" in reflection_lower
-        ):
-            adjustments["relational"] += 0.1
-        if "supported" in reflection_lower or "connected" in reflection_lower:
-            adjustments["relational"] -= 0.05
-        if "unsafe" in reflection_lower or "fear" in reflection_lower:
-            adjustments["safety"] += 0.1
-        if "secure" in reflection_lower or "protected" in reflection_lower:
-            adjustments["safety"] -= 0.05
+        adjustments = _reflection_adjustments(reflection.lower())
+        if adjustments is None:
+            # No trigger words (the common case): the weighted sum would be zero
+            self.last_update = time.time()
+            return
 
         total_adjustment = (
             self.calibration["time_weight"] * adjustments["time"]
@@ -77,7 +113,7 @@ class PracticalConsequenceEngine:
             self.score,
             adjustments,
         )
-        self.last_update = datetime.utcnow().isoformat()
+        self.last_update = time.time()
 
     def compute_consequence(self) -> float:
         return round(self.score, 2)
@@ -128,11 +164,24 @@ class PracticalConsequenceEngine:
         return {
             "calibration": self.calibration,
             "score": self.score,
-            "last_update": self.last_update,
+            # Naive-UTC ISO string, the format this field has always been stored in
+            "last_update": datetime.fromtimestamp(self.last_update, timezone.utc)
+            .replace(tzinfo=None)
+            .isoformat(),
         }
 
     def update_from_dict(self, data: dict):
         if "calibration" in data:
             self.calibration.update(data["calibration"])
         self.score = data.get("score", self.score)
-        self.last_update = data.get("last_update", self.last_update)
+        last_update = data.get("last_update")
+        if isinstance(last_update, (int, float)):
+            self.last_update = float(last_update)
+        elif isinstance(last_update, str):
+            try:
+                parsed = datetime.fromisoformat(last_update.replace("Z", "+00:00"))
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                self.last_update = parsed.timestamp()
+            except ValueError:
+                logger.warning("Could not parse last_update: %s", last_update)
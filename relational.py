@@ -1,57 +1,138 @@
+import asyncio
 import json
 import logging
 import re
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable
+
+from forest_app.config.constants import LLM_MAX_CONCURRENCY
+from forest_app.core.utils import dumps_compact, loads_json
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Attempt to import the LLM integration; provide a dummy fallback if unavailable
-try:
-    from forest_app.integrations.llm import generate_response
-except ImportError:
-    logger.error("LLM integration 'generate_response' not found. Dynamic methods will fail.")
-
-    async def generate_response(prompt: str) -> str:
-        logger.warning("Using dummy generate_response. LLM calls disabled.")
-        if "Relational Repair Request" in prompt:
-            return json.dumps({
-                "repair_action": "Default fallback action.",
-                "tone": "Gentle",
-                "scale": "Medium",
-            })
-        elif "Relational Profile Update Request" in prompt:
-            return json.dumps({"score_delta": 0.0, "tag_updates": {}})
-        elif "Relational Deepening Suggestion Request" in prompt:
-            return json.dumps({
-                "deepening_suggestion": "Default deepening suggestion.",
-                "tone": "supportive",
-            })
-        else:
-            return "{}"
+
+# Stand-in used when the LLM integration cannot be imported.
+async def _dummy_generate_response(prompt: str) -> str:
+    logger.warning("Using dummy generate_response. LLM calls disabled.")
+    if "Relational Repair Request" in prompt:
+        return json.dumps({
+            "repair_action": "Default fallback action.",
+            "tone": "Gentle",
+            "scale": "Medium",
+        })
+    elif "Relational Profile Update Request" in prompt:
+        return json.dumps({"score_delta": 0.0, "tag_updates": {}})
+    elif "Relational Deepening Suggestion Request" in prompt:
+        return json.dumps({
+            "deepening_suggestion": "Default deepening suggestion.",
+            "tone": "supportive",
+        })
+    else:
+        return "{}"
+
+
+# The LLM integration is imported on first dynamic call, so static-only users
+# never load it; the dummy is used if it is unavailable.
+_generate_response = None
+
+
+def _get_generate_response():
+    global _generate_response
+    if _generate_response is None:
+        try:
+            from forest_app.integrations.llm import generate_response
+            _generate_response = generate_response
+        except ImportError:
+            logger.error("LLM integration 'generate_response' not found. Dynamic methods will fail.")
+            _generate_response = _dummy_generate_response
+    return _generate_response
+
+
+# Relational signal keywords, matched as whole words in a single precompiled pass.
+_SUPPORT_KW = frozenset(("support", "helped", "appreciated", "cared", "kind"))
+_CONFLICT_KW = frozenset(("argued", "conflict", "hurt", "ignored", "criticized"))
+_INTERACTION_KW_RE = re.compile(
+    r"\b(" + "|".join(sorted(_SUPPORT_KW | _CONFLICT_KW)) + r")\b"
+)
+
+# Snapshot fields forwarded to the LLM as context for dynamic repair actions.
+_PRUNE_KEYS = ("xp", "capacity", "shadow_score", "relationship_metrics")
+
+# Prompt scaffolding; the header lines double as request markers for the dummy responder.
+_REPAIR_PROMPT_TMPL = (
+    "Relational Repair Request:\n"
+    "Profile: {profile}\n"
+    "Context: {ctx}\n"
+    "Love language: '{lang}', connection_score: {score}\n"
+    "Output JSON with keys 'repair_action', 'tone', 'scale'."
+)
+_UPDATE_PROMPT_TMPL = (
+    "Relational Profile Update Request:\n"
+    "Profile: {profile}\n"
+    "Reflection: {reflection}\n"
+    "Output JSON with 'score_delta', 'tag_updates', optional 'love_language'."
+)
+_DEEPEN_PROMPT_TMPL = (
+    "Relational Deepening Suggestion Request:\n"
+    "Profile: {profile}\n"
+    "Extra Context: {ctx}\n"
+    "Output JSON with 'deepening_suggestion' and 'tone'."
+)
+
+
+# Shared across every RelationalManager so the cap holds process-wide. Created on
+# first use inside a running loop (and again if a later call runs on a new loop).
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+_llm_semaphore_loop = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore, _llm_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _llm_semaphore is None or _llm_semaphore_loop is not loop:
+        _llm_semaphore = asyncio.Semaphore(max(1, LLM_MAX_CONCURRENCY))
+        _llm_semaphore_loop = loop
+    return _llm_semaphore
+
+
+async def _bounded_generate(prompt: str):
+    """generate_response, waiting for a free slot under LLM_MAX_CONCURRENCY."""
+    async with _get_llm_semaphore():
+        return await (_generate_response or _get_generate_response())(prompt)
+
 
 
 class Profile:
     """Represents a profile for relational tracking within the Forest system."""
 
+    __slots__ = (
+        "name",
+        "emotional_tags",
+        "love_language",
+        "last_gifted",
+        "connection_score",
+        "_json_cache",
+    )
+
     def __init__(self, name: str):
         self.name: str = name
         self.emotional_tags: Dict[str, float] = {}
         self.love_language: str = "Words of Affirmation"
         self.last_gifted: Optional[str] = None
         self.connection_score: float = 5.0
+        self._json_cache: Optional[str] = None  # Cleared by the update_* mutators
 
     def update_emotional_tags(self, new_tags: dict):
         """Updates emotional tags with provided deltas, clamping between 0 and 10."""
         if not isinstance(new_tags, dict):
             logger.warning("Invalid type for new_tags: %s", type(new_tags))
             return
+        self._json_cache = None
+        tags = self.emotional_tags
+        get = tags.get
         for tag, value in new_tags.items():
             try:
-                current = self.emotional_tags.get(tag, 0.0)
-                delta = float(value)
-                updated = max(0.0, min(10.0, current + delta))
-                self.emotional_tags[tag] = round(updated, 2)
+                tags[tag] = round(min(10.0, max(0.0, get(tag, 0.0) + float(value))), 2)
             except (ValueError, TypeError):
                 logger.warning("Invalid value for tag '%s': %s", tag, value)
         logger.info("Profile '%s' emotional_tags updated to %s", self.name, self.emotional_tags)
@@ -60,6 +141,7 @@ class Profile:
         """Updates connection score by a delta, clamping between 0 and 10."""
         try:
             delta_float = float(delta)
+            self._json_cache = None
             old = self.connection_score
             self.connection_score = max(0.0, min(10.0, self.connection_score + delta_float))
             logger.info("Profile '%s' connection_score: %.2f → %.2f", self.name, old, self.connection_score)
@@ -69,6 +151,7 @@ class Profile:
     def update_love_language(self, new_love_language: str):
         """Updates the profile's love language if valid."""
         if isinstance(new_love_language, str) and new_love_language:
+            self._json_cache = None
             old = self.love_language
             self.love_language = new_love_language
             logger.info("Profile '%s' love_language: '%s' → '%s'", self.name, old, self.love_language)
@@ -85,6 +168,15 @@ class Profile:
             "connection_score": self.connection_score,
         }
 
+    def to_json(self) -> str:
+        """Compact JSON of ``to_dict()`` for prompts, reused until a mutator runs.
+
+        Code assigning attributes directly must set ``_json_cache = None`` itself.
+        """
+        if self._json_cache is None:
+            self._json_cache = dumps_compact(self.to_dict())
+        return self._json_cache
+
     @classmethod
     def from_dict(cls, data: dict) -> "Profile":
         """Creates Profile instance from a dict."""
@@ -115,8 +207,11 @@ class RelationalRepairEngine:
             logger.error("Invalid profile in generate_repair_action.")
             return {}
 
-        # Determine dominant tag
-        dominant_tag = max(profile.emotional_tags.items(), key=lambda kv: kv[1], default=("compassion", 0.0))[0]
+        # Determine dominant tag (first highest value wins, as max() would)
+        dominant_tag, dominant_val = "compassion", None
+        for tag, val in profile.emotional_tags.items():
+            if dominant_val is None or val > dominant_val:
+                dominant_tag, dominant_val = tag, val
         score = profile.connection_score
         if score < 3.0:
             tone = "Cautious"
@@ -146,22 +241,16 @@ class RelationalRepairEngine:
             logger.error("Invalid profile in generate_dynamic_repair_action.")
             return {}
 
-        pruned = {
-            "xp": snapshot.get("xp"),
-            "capacity": snapshot.get("capacity"),
-            "shadow_score": snapshot.get("shadow_score"),
-            "relationship_metrics": snapshot.get("relationship_metrics"),
-        }
-        prompt = (
-            f"Relational Repair Request:\n"
-            f"Profile: {json.dumps(profile.to_dict())}\n"
-            f"Context: {json.dumps(pruned)}\n"
-            f"Love language: '{profile.love_language}', connection_score: {profile.connection_score:.1f}\n"
-            f"Output JSON with keys 'repair_action', 'tone', 'scale'."
-        )
+        pruned = {k: snapshot.get(k) for k in _PRUNE_KEYS}
+        prompt = _REPAIR_PROMPT_TMPL.format_map({
+            "profile": profile.to_json(),
+            "ctx": dumps_compact(pruned),
+            "lang": profile.love_language,
+            "score": f"{profile.connection_score:.1f}",
+        })
         try:
-            raw = (await generate_response(prompt)).strip()
-            data = json.loads(raw)
+            raw = (await _bounded_generate(prompt)).strip()
+            data = loads_json(raw)
             repair_action = data.get("repair_action", "")
             tone = data.get("tone", "Gentle")
             scale = data.get("scale", "Medium")
@@ -189,6 +278,7 @@ class RelationalManager:
 
     def __init__(self):
         self.profiles: Dict[str, Profile] = {}
+        self._repair_engine = RelationalRepairEngine()  # Stateless; shared across calls
 
     def add_or_update_profile(self, profile_data: dict) -> Optional[Profile]:
         """Adds or updates a profile from provided data."""
@@ -234,12 +324,11 @@ class RelationalManager:
         if not reflection_text or not isinstance(reflection_text, str):
             return default_signals
 
-        text = reflection_text.lower()
-        support_kw = ["support", "helped", "appreciated", "cared", "kind"]
-        conflict_kw = ["argued", "conflict", "hurt", "ignored", "criticized"]
-
-        support_score = sum(0.1 for w in support_kw if re.search(rf"\b{w}\b", text))
-        conflict_score = sum(-0.1 for w in conflict_kw if re.search(rf"\b{w}\b", text))
+        # One scan collects every distinct keyword present; each scores once, as before
+        hits = set(_INTERACTION_KW_RE.findall(reflection_text.lower()))
+        support_score = 0.1 * len(hits & _SUPPORT_KW)
+        conflict_hits = len(hits & _CONFLICT_KW)
+        conflict_score = -0.1 * conflict_hits if conflict_hits else 0.0
 
         signals = {
             "support": round(support_score, 2),
@@ -265,15 +354,13 @@ class RelationalManager:
             logger.warning("Profile '%s' not found.", profile_name)
             return {}
 
-        prompt = (
-            f"Relational Profile Update Request:\n"
-            f"Profile: {json.dumps(profile.to_dict())}\n"
-            f"Reflection: {reflection_text}\n"
-            f"Output JSON with 'score_delta', 'tag_updates', optional 'love_language'."
-        )
+        prompt = _UPDATE_PROMPT_TMPL.format_map({
+            "profile": profile.to_json(),
+            "reflection": reflection_text,
+        })
         try:
-            raw = (await generate_response(prompt)).strip()
-            data = json.loads(raw)
+            raw = (await _bounded_generate(prompt)).strip()
+            data = loads_json(raw)
             if not isinstance(data, dict):
                 raise ValueError("LLM returned non-dict")
         except Exception as e:
@@ -294,8 +381,7 @@ class RelationalManager:
         if not profile:
             logger.warning("Profile '%s' not found for repair.", name)
             return {}
-        engine = RelationalRepairEngine()
-        return await engine.generate_dynamic_repair_action(profile, snapshot, context)
+        return await self._repair_engine.generate_dynamic_repair_action(profile, snapshot, context)
 
     async def generate_deepening_suggestion(self, name: str, snapshot: dict, context: str = "") -> dict:
         """Generates a relationship deepening suggestion via LLM."""
@@ -308,15 +394,13 @@ class RelationalManager:
             "emotional_tags": profile.emotional_tags,
             "connection_score": profile.connection_score,
         }
-        prompt = (
-            f"Relational Deepening Suggestion Request:\n"
-            f"Profile: {json.dumps(profile.to_dict())}\n"
-            f"Extra Context: {json.dumps(extra_ctx)}\n"
-            f"Output JSON with 'deepening_suggestion' and 'tone'."
-        )
+        prompt = _DEEPEN_PROMPT_TMPL.format_map({
+            "profile": profile.to_json(),
+            "ctx": dumps_compact(extra_ctx),
+        })
         try:
-            raw = (await generate_response(prompt)).strip()
-            data = json.loads(raw)
+            raw = (await _bounded_generate(prompt)).strip()
+            data = loads_json(raw)
             if not isinstance(data, dict):
                 raise ValueError("LLM returned non-dict")
         except Exception as e:
@@ -329,6 +413,48 @@ class RelationalManager:
         logger.info("Deepening suggestion for '%s': %s", name, data)
         return data
 
+    # --- Batch variants: fan the per-profile LLM calls out concurrently ---
+    # Each call already waits on the shared LLM_MAX_CONCURRENCY semaphore in
+    # _bounded_generate, so the batches do not add a limit of their own.
+    async def _batch(self, names: Iterable[str], make_coro, label: str) -> Dict[str, dict]:
+        """Runs ``make_coro(name)`` for each distinct name; failures map to {}."""
+        unique_names = list(dict.fromkeys(names))
+        results = await asyncio.gather(*(make_coro(n) for n in unique_names), return_exceptions=True)
+        out: Dict[str, dict] = {}
+        for name, result in zip(unique_names, results):
+            if isinstance(result, BaseException):
+                logger.warning("%s failed for '%s': %s", label, name, result)
+                result = {}
+            out[name] = result
+        return out
+
+    async def batch_infer_profile_updates(
+        self, profile_names: Iterable[str], reflection_text: str,
+    ) -> Dict[str, dict]:
+        """infer_profile_updates for several profiles at once, keyed by profile name."""
+        return await self._batch(
+            profile_names, lambda n: self.infer_profile_updates(n, reflection_text),
+            "Profile inference",
+        )
+
+    async def batch_generate_repairs(
+        self, names: Iterable[str], snapshot: dict, context: str = "",
+    ) -> Dict[str, dict]:
+        """generate_repair_for_profile for several profiles at once, keyed by profile name."""
+        return await self._batch(
+            names, lambda n: self.generate_repair_for_profile(n, snapshot, context),
+            "Repair generation",
+        )
+
+    async def batch_generate_deepening_suggestions(
+        self, names: Iterable[str], snapshot: dict, context: str = "",
+    ) -> Dict[str, dict]:
+        """generate_deepening_suggestion for several profiles at once, keyed by profile name."""
+        return await self._batch(
+            names, lambda n: self.generate_deepening_suggestion(n, snapshot, context),
+            "Deepening suggestion",
+        )
+
     def to_dict(self) -> dict:
         """Serializes all profiles to a dict."""
         return {"profiles": {n: p.to_dict() for n, p in self.profiles.items()}}
@@ -1,9 +1,10 @@
 # forest_app/persistence/repository.py
 
 import logging
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 
 # Import your ORM models
 from .models import MemorySnapshotModel, TaskEventLog, ReflectionEventLog
@@ -11,6 +12,19 @@ from .models import MemorySnapshotModel, TaskEventLog, ReflectionEventLog
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Rows fetched per round-trip when streaming event logs.
+LOG_STREAM_BATCH_SIZE = 500
+
+
+def _stream_scalars(db: Session, stmt, what: str) -> Iterator[Any]:
+    """Yields ORM rows for ``stmt`` in batches over a server-side cursor."""
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True))
+        yield from result.yield_per(LOG_STREAM_BATCH_SIZE).scalars()
+    except SQLAlchemyError as e:
+        logger.error("Database error streaming %s: %s", what, e)
+        raise
+
 
 # --- MemorySnapshotRepository ---
 class MemorySnapshotRepository:
@@ -52,7 +66,8 @@ class MemorySnapshotRepository:
                 self.db.query(MemorySnapshotModel)
                 .filter(MemorySnapshotModel.user_id == user_id)
                 .order_by(MemorySnapshotModel.updated_at.desc())
-                .first()
+                .limit(1)
+                .one_or_none()
             )
         except SQLAlchemyError as e:
             logger.error(
@@ -98,6 +113,31 @@ class MemorySnapshotRepository:
             )
             raise
 
+    def update_snapshot_fast(self, snapshot_id: int, new_data: dict) -> bool:
+        """
+        Overwrites a snapshot's data with a single UPDATE, skipping the ORM
+        load and post-commit refresh. Returns False if no row matched.
+        Use update_snapshot() when the refreshed model is needed.
+        """
+        stmt = (
+            update(MemorySnapshotModel)
+            .where(MemorySnapshotModel.id == snapshot_id)
+            .values(snapshot_data=new_data, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = self.db.execute(stmt)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error("Database error updating snapshot id %s: %s", snapshot_id, e)
+            raise
+        if result.rowcount == 0:
+            logger.warning("No snapshot with id %s to update.", snapshot_id)
+            return False
+        logger.info("Updated snapshot id %s", snapshot_id)
+        return True
+
     def delete_snapshot(self, snapshot_model: MemorySnapshotModel):
         """Deletes an existing MemorySnapshot from the database."""
         if not snapshot_model:
@@ -126,8 +166,14 @@ class TaskEventLogRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_log(self, log_data: Dict[str, Any]) -> Optional[TaskEventLog]:
-        """Creates a new task event log entry in the database."""
+    def create_log(
+        self, log_data: Dict[str, Any], commit: bool = True
+    ) -> Optional[TaskEventLog]:
+        """Creates a new task event log entry in the database.
+
+        With ``commit=False`` the entry is only flushed, joining the caller's
+        transaction; the caller's next commit persists it.
+        """
         if not log_data.get("task_id") or not log_data.get("event_type"):
             logger.error("Task ID and Event Type are required for Task Event Log.")
             return None
@@ -135,8 +181,11 @@ class TaskEventLogRepository:
         log_entry = TaskEventLog(**log_data)
         try:
             self.db.add(log_entry)
-            self.db.commit()
-            self.db.refresh(log_entry)
+            if commit:
+                self.db.commit()
+                self.db.refresh(log_entry)
+            else:
+                self.db.flush()
             logger.info(
                 "Created Task Event Log entry ID %s for task %s",
                 log_entry.id,
@@ -160,15 +209,61 @@ class TaskEventLogRepository:
             )
             raise
 
+    def create_logs(self, log_data_list: List[Dict[str, Any]]) -> int:
+        """Inserts many task event log entries with a single commit.
+
+        Rows missing task_id/event_type are skipped. Entries are not refreshed,
+        so no per-row SELECT is issued; returns the number of rows written.
+        """
+        valid = [
+            TaskEventLog(**d)
+            for d in log_data_list
+            if d.get("task_id") and d.get("event_type")
+        ]
+        if len(valid) != len(log_data_list):
+            logger.error(
+                "Skipped %d Task Event Log rows missing Task ID or Event Type.",
+                len(log_data_list) - len(valid),
+            )
+        if not valid:
+            return 0
+        try:
+            self.db.bulk_save_objects(valid)
+            self.db.commit()
+            logger.info("Created %d Task Event Log entries", len(valid))
+            return len(valid)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error("Database error bulk-creating task event logs: %s", e)
+            raise
+        except Exception as e:
+            self.db.rollback()
+            logger.error("Unexpected error bulk-creating task event logs: %s", e)
+            raise
+
+    def iter_logs_for_task(self, task_id: str) -> Iterator[TaskEventLog]:
+        """Streams log entries for a task, oldest first, without loading them all."""
+        stmt = (
+            select(TaskEventLog)
+            .where(TaskEventLog.task_id == task_id)
+            .order_by(TaskEventLog.timestamp.asc())
+        )
+        return _stream_scalars(self.db, stmt, f"logs for task {task_id}")
+
+    def count_logs_for_task(self, task_id: str) -> int:
+        """Number of log entries for a task, counted in the database."""
+        try:
+            return self.db.scalar(
+                select(func.count(TaskEventLog.id)).where(TaskEventLog.task_id == task_id)
+            ) or 0
+        except SQLAlchemyError as e:
+            logger.error("Database error counting logs for task %s: %s", task_id, e)
+            raise
+
     def get_logs_for_task(self, task_id: str) -> List[TaskEventLog]:
         """Retrieves all log entries for a specific task."""
         try:
-            return (
-                self.db.query(TaskEventLog)
-                .filter(TaskEventLog.task_id == task_id)
-                .order_by(TaskEventLog.timestamp.asc())
-                .all()
-            )
+            return list(self.iter_logs_for_task(task_id))
         except SQLAlchemyError as e:
             logger.error("Database error retrieving logs for task %s: %s", task_id, e)
             raise
@@ -220,15 +315,65 @@ class ReflectionEventLogRepository:
             )
             raise
 
+    def create_logs(self, log_data_list: List[Dict[str, Any]]) -> int:
+        """Inserts many reflection event log entries with a single commit.
+
+        Rows missing reflection_id/event_type are skipped. Entries are not
+        refreshed; returns the number of rows written.
+        """
+        valid = [
+            ReflectionEventLog(**d)
+            for d in log_data_list
+            if d.get("reflection_id") and d.get("event_type")
+        ]
+        if len(valid) != len(log_data_list):
+            logger.error(
+                "Skipped %d Reflection Event Log rows missing Reflection ID or Event Type.",
+                len(log_data_list) - len(valid),
+            )
+        if not valid:
+            return 0
+        try:
+            self.db.bulk_save_objects(valid)
+            self.db.commit()
+            logger.info("Created %d Reflection Event Log entries", len(valid))
+            return len(valid)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error("Database error bulk-creating reflection event logs: %s", e)
+            raise
+        except Exception as e:
+            self.db.rollback()
+            logger.error("Unexpected error bulk-creating reflection event logs: %s", e)
+            raise
+
+    def iter_logs_for_reflection(self, reflection_id: str) -> Iterator[ReflectionEventLog]:
+        """Streams log entries for a reflection, oldest first, without loading them all."""
+        stmt = (
+            select(ReflectionEventLog)
+            .where(ReflectionEventLog.reflection_id == reflection_id)
+            .order_by(ReflectionEventLog.timestamp.asc())
+        )
+        return _stream_scalars(self.db, stmt, f"logs for reflection {reflection_id}")
+
+    def count_logs_for_reflection(self, reflection_id: str) -> int:
+        """Number of log entries for a reflection, counted in the database."""
+        try:
+            return self.db.scalar(
+                select(func.count(ReflectionEventLog.id)).where(
+                    ReflectionEventLog.reflection_id == reflection_id
+                )
+            ) or 0
+        except SQLAlchemyError as e:
+            logger.error(
+                "Database error counting logs for reflection %s: %s", reflection_id, e
+            )
+            raise
+
     def get_logs_for_reflection(self, reflection_id: str) -> List[ReflectionEventLog]:
         """Retrieves all log entries for a specific reflection event."""
         try:
-            return (
-                self.db.query(ReflectionEventLog)
-                .filter(ReflectionEventLog.reflection_id == reflection_id)
-                .order_by(ReflectionEventLog.timestamp.asc())
-                .all()
-            )
+            return list(self.iter_logs_for_reflection(reflection_id))
         except SQLAlchemyError as e:
             logger.error(
                 "Database error retrieving logs for reflection %s: %s", reflection_id, e
@@ -1,6 +1,12 @@
 # forest_app/modules/resistance_engine.py
 
 import logging
+from typing import Sequence
+
+try:
+    import numpy as np  # Optional; enables the vectorised compute_batch path
+except ImportError:
+    np = None
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -49,17 +55,45 @@ class ResistanceEngine:
         Returns:
             resistance R, clamped to [0.0, 1.0]
         """
-        base = 0.4
+        # 0.4 + 0.05 * (M - 5) folded to 0.15 + 0.05 * M
         comp = (
-            base
+            0.15
             + 0.5 * shadow_score
             - 0.3 * capacity
             - 0.2 * momentum
-            + 0.05 * (magnitude - 5.0)
-        )
-        r = clamp01(comp)
-        logger.debug(
-            "Computed resistance: base=%.2f +0.5*σ(%.2f) -0.3*c(%.2f) -0.2*μ(%.2f) +0.05*(M-5)(%.2f) = %.2f → R=%.2f",
-            base, shadow_score, capacity, momentum, (magnitude - 5.0), comp, r
+            + 0.05 * magnitude
         )
-        return r
\ No newline at end of file
+        # Inline clamp01; comparison order keeps its NaN -> 1.0 mapping
+        r = 0.0 if comp < 0.0 else comp if comp <= 1.0 else 1.0
+        # Called per task in tight loops: skip building the log record's args unless needed
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Computed resistance: base=%.2f +0.5*σ(%.2f) -0.3*c(%.2f) -0.2*μ(%.2f) +0.05*(M-5)(%.2f) = %.2f → R=%.2f",
+                0.4, shadow_score, capacity, momentum, (magnitude - 5.0), comp, r
+            )
+        return r
+
+    @staticmethod
+    def compute_batch(
+        shadow_scores: Sequence[float],
+        capacities: Sequence[float],
+        momenta: Sequence[float],
+        magnitudes: Sequence[float],
+    ):
+        """
+        Vectorised ``compute`` over equal-length sequences of task metrics.
+
+        Returns a NumPy array when NumPy is installed, otherwise a list.
+        """
+        if np is not None:
+            s = np.asarray(shadow_scores, dtype=float)
+            c = np.asarray(capacities, dtype=float)
+            m = np.asarray(momenta, dtype=float)
+            M = np.asarray(magnitudes, dtype=float)
+            r = np.clip(0.15 + 0.5 * s - 0.3 * c - 0.2 * m + 0.05 * M, 0.0, 1.0)
+            r[np.isnan(r)] = 1.0  # np.clip keeps NaN; match clamp01 / compute
+            return r
+        return [
+            clamp01(0.15 + 0.5 * s - 0.3 * c - 0.2 * m + 0.05 * M)
+            for s, c, m, M in zip(shadow_scores, capacities, momenta, magnitudes)
+        ]
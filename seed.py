@@ -1,14 +1,19 @@
 # forest_app/modules/seed.py
 
-import json
 import logging
-import uuid
-from datetime import datetime
-from typing import List, Optional
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+from forest_app.core.utils import dumps_indented
 
 # Initialize logger immediately so it's available in the import fallback
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
+# Log calls stay as logger.<level>(...) rather than module-bound aliases: the attribute
+# lookup is ~30ns against ~5us to emit a record, and costly argument building is
+# guarded with isEnabledFor where it matters (update_seed, ResistanceEngine.compute).
 
 # Import HTATree and HTANode from our HTA module.
 # Ensure this import path is correct for your structure
@@ -70,10 +75,46 @@ except ImportError:
             pass  # Dummy method
 
 
+def _new_id() -> str:
+    """Random 128-bit hex id for seeds and their HTA roots; skips building a UUID object."""
+    return os.urandom(16).hex()
+
+
+def _to_unix(value: Union[str, float]) -> Union[float, str]:
+    """Unix seconds from a stored created_at (epoch number or ISO string; naive means UTC).
+
+    An unparseable value is returned unchanged so it round-trips as stored.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        logger.warning("Could not parse created_at %r; keeping the stored value.", value)
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
 class Seed:
     """
     Represents a symbolic Seed within the Forest system.
     """
+    __slots__ = (
+        "seed_id",
+        "seed_name",
+        "seed_domain",
+        "seed_form",
+        "description",
+        "emotional_root_tags",
+        "shadow_trigger",
+        "associated_archetypes",
+        "status",
+        "created_at_ts",
+        "hta_tree",
+    )
+
     def __init__(
         self,
         seed_name: str,
@@ -85,10 +126,10 @@ class Seed:
         associated_archetypes: Optional[List[str]] = None,
         status: str = "active",
         seed_id: Optional[str] = None,
-        created_at: Optional[str] = None,
+        created_at: Optional[Union[str, float]] = None,
         hta_tree: Optional[dict] = None,
     ):
-        self.seed_id = seed_id or str(uuid.uuid4())
+        self.seed_id = seed_id or _new_id()
         self.seed_name = seed_name
         self.seed_domain = seed_domain
         self.seed_form = seed_form or ""
@@ -97,7 +138,7 @@ class Seed:
         self.shadow_trigger = shadow_trigger or ""
         self.associated_archetypes = associated_archetypes or []
         self.status = status
-        self.created_at = created_at or datetime.utcnow().isoformat()
+        self.created_at_ts = _to_unix(created_at) if created_at else time.time()
         self.hta_tree = hta_tree or {}
 
     def to_dict(self) -> dict:
@@ -117,19 +158,34 @@ class Seed:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Seed":
-        return cls(
-            seed_name=data.get("seed_name", ""),
-            seed_domain=data.get("seed_domain", ""),
-            seed_form=data.get("seed_form", ""),
-            description=data.get("description", ""),
-            emotional_root_tags=data.get("emotional_root_tags", []),
-            shadow_trigger=data.get("shadow_trigger", ""),
-            associated_archetypes=data.get("associated_archetypes", []),
-            status=data.get("status", "active"),
-            seed_id=data.get("seed_id"),
-            created_at=data.get("created_at"),
-            hta_tree=data.get("hta_tree"),
-        )
+        # Assigns slots directly (same defaults as __init__) to skip the kwargs round-trip on bulk loads
+        get = data.get
+        seed = object.__new__(cls)
+        seed.seed_id = get("seed_id") or _new_id()
+        seed.seed_name = get("seed_name", "")
+        seed.seed_domain = get("seed_domain", "")
+        seed.seed_form = get("seed_form") or ""
+        seed.description = get("description") or ""
+        seed.emotional_root_tags = get("emotional_root_tags") or []
+        seed.shadow_trigger = get("shadow_trigger") or ""
+        seed.associated_archetypes = get("associated_archetypes") or []
+        seed.status = get("status", "active")
+        created_at = get("created_at")
+        seed.created_at_ts = _to_unix(created_at) if created_at else time.time()
+        seed.hta_tree = get("hta_tree") or {}
+        return seed
+
+    @property
+    def created_at(self) -> str:
+        """Creation time as a naive-UTC ISO string, the format seeds have always been stored in."""
+        ts = self.created_at_ts
+        if not isinstance(ts, float):
+            return ts  # Unparseable stored value, kept verbatim
+        return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+    @created_at.setter
+    def created_at(self, value: Union[str, float]):
+        self.created_at_ts = _to_unix(value)
 
     def update_status(self, new_status: str):
         old = self.status
@@ -140,8 +196,13 @@ class Seed:
         self.description = new_description
         logger.info("Seed '%s' description updated.", self.seed_name)
 
-    def __str__(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+    def to_json(self) -> str:
+        """Full seed (including its HTA tree) as indented JSON."""
+        return dumps_indented(self.to_dict())
+
+    def __repr__(self) -> str:
+        # Kept cheap on purpose: seeds end up in log arguments
+        return f"Seed({self.seed_id[:8]}, {self.seed_name!r}, status={self.status})"
 
 
 class SeedManager:
@@ -150,25 +211,31 @@ class SeedManager:
     """
     def __init__(self):
         self.seeds: List[Seed] = []
+        self._by_id: Dict[str, Seed] = {}  # seed_id -> Seed, kept in step with self.seeds
+        self._summary_cache: Optional[str] = None  # Cleared by every SeedManager mutator
 
     def add_seed(self, seed: Seed) -> None:
-        if any(s.seed_id == seed.seed_id for s in self.seeds):
+        if seed.seed_id in self._by_id:
             logger.warning("Seed with ID %s already exists. Skipping.", seed.seed_id)
             return
+        self._by_id[seed.seed_id] = seed
         self.seeds.append(seed)
+        self._summary_cache = None
         logger.info("Added seed '%s' (ID: %s).", seed.seed_name, seed.seed_id)
 
     def remove_seed_by_id(self, seed_id: str) -> bool:
-        initial = len(self.seeds)
-        self.seeds = [s for s in self.seeds if s.seed_id != seed_id]
-        if len(self.seeds) < initial:
-            logger.info("Removed seed ID %s.", seed_id)
-            return True
-        logger.warning("Seed ID %s not found for removal.", seed_id)
-        return False
+        seed = self._by_id.pop(seed_id, None)
+        if seed is None:
+            logger.warning("Seed ID %s not found for removal.", seed_id)
+            return False
+        # In-place identity removal (Seed has no __eq__); keeps order, which decides the primary seed
+        self.seeds.remove(seed)
+        self._summary_cache = None
+        logger.info("Removed seed ID %s.", seed_id)
+        return True
 
     def get_seed_by_id(self, seed_id: str) -> Optional[Seed]:
-        return next((s for s in self.seeds if s.seed_id == seed_id), None)
+        return self._by_id.get(seed_id)
 
     def get_all_seeds(self) -> List[Seed]:
         return self.seeds
@@ -179,13 +246,17 @@ class SeedManager:
             return False
         fields = []
         for key, val in kwargs.items():
-            if hasattr(seed, key):
+            if key == "seed_id":
+                logger.warning("Seed IDs cannot be changed via update_seed. Ignored.")
+            elif hasattr(seed, key):
                 setattr(seed, key, val)
                 fields.append(key)
             else:
                 logger.warning("No attribute '%s' on Seed. Ignored.", key)
         if fields:
-            logger.info("Updated seed %s fields: %s.", seed_id, ", ".join(fields))
+            self._summary_cache = None
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Updated seed %s fields: %s.", seed_id, ", ".join(fields))
             return True
         return False
 
@@ -214,7 +285,7 @@ class SeedManager:
         )
 
         root_node = HTANode(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             title=new_seed.seed_name,
             description=new_seed.description,
             priority=1.0,
@@ -234,6 +305,7 @@ class SeedManager:
             return False
 
         et = evolution_type.lower()
+        self._summary_cache = None
         if et == "reframe":
             if new_intention:
                 seed.description = new_intention
@@ -255,29 +327,46 @@ class SeedManager:
             logger.warning("Unknown evolution '%s'.", evolution_type)
             return False
 
-        try:
-            tree = HTATree.from_dict(seed.hta_tree)
-            # ... evolution-specific HTA adjustments ...
-            seed.hta_tree = tree.to_dict()
-            logger.info("HTA tree updated for seed '%s'.", seed.seed_name)
-        except Exception as e:
-            logger.error("Error updating HTA tree: %s", e)
-            return False
-
+        # No evolution type adjusts the HTA tree yet, so seed.hta_tree is left as-is
+        # rather than round-tripping it through HTATree.from_dict/to_dict. When
+        # adjustments are added, parse the tree only in the branch that changes it.
         return True
 
     def get_seed_summary(self) -> str:
-        active = [s for s in self.seeds if s.status.lower() == "active"]
-        if not active:
-            return "No active seeds."
-        return " • ".join(f"{s.seed_name} ({s.seed_domain})" for s in active)
+        """Active seeds as 'name (domain)' joined by bullets; reused until a mutator runs.
+
+        Code changing a Seed's name, domain or status directly must set ``_summary_cache = None``.
+        """
+        if self._summary_cache is None:
+            summary = " • ".join(
+                f"{s.seed_name} ({s.seed_domain})" for s in self.seeds if s.status.lower() == "active"
+            )
+            self._summary_cache = summary or "No active seeds."
+        return self._summary_cache
 
     def to_dict(self) -> dict:
         return {"seeds": [s.to_dict() for s in self.seeds]}
 
     def update_from_dict(self, data: dict):
-        seed_list = data.get("seeds", [])
-        self.seeds = [Seed.from_dict(d) for d in seed_list]
-
-    def __str__(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+        # Build list and index together in locals, then swap in, so a bad entry
+        # leaves the previous state intact instead of a half-loaded manager
+        seeds: List[Seed] = []
+        by_id: Dict[str, Seed] = {}
+        from_dict = Seed.from_dict
+        for d in data.get("seeds", []):
+            seed = from_dict(d)
+            if seed.seed_id in by_id:
+                logger.warning("Duplicate seed ID %s in stored state. Skipping.", seed.seed_id)
+                continue
+            by_id[seed.seed_id] = seed
+            seeds.append(seed)
+        self.seeds = seeds
+        self._by_id = by_id
+        self._summary_cache = None
+
+    def to_json(self) -> str:
+        """All seeds, with their HTA trees, as indented JSON."""
+        return dumps_indented(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"SeedManager(n={len(self.seeds)})"
@@ -1,9 +1,12 @@
 # forest_app/modules/sentiment.py
 
-import json
+import asyncio
 import logging
+from types import MappingProxyType
 # --- MODIFICATION START: Import necessary items ---
-from typing import Any # Make sure these are present
+from typing import Any, Iterable, List, Optional, Tuple # Make sure these are present
+
+from forest_app.core.utils import dumps_compact
 
 # Import the LLM interface AND the necessary models/exceptions
 # Assumes llm.py defines SentimentResponseModel and LLMValidationError
@@ -57,6 +60,51 @@ except ImportError as import_err:
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Shared read-only default for the snapshot .get() chains, so misses don't allocate a dict each.
+_EMPTY = MappingProxyType({})
+
+# Default cap on concurrent LLM calls made by analyze_batch.
+DEFAULT_BATCH_CONCURRENCY = 8
+
+# Static parts of the sentiment prompt; only the reflection, context and modifier vary per call.
+_SENTIMENT_PROMPT_HEADER = (
+    "You are the Arbiter of The Forest—a poetic, deeply attuned guide tasked with interpreting the "
+    "user's internal emotional landscape. Analyze the following user reflection in light of the provided contextual data. \n\n"
+    'Reflection Text:\n"""\n'
+)
+_SENTIMENT_CONTEXT_SEP = '\n"""\n\nContextual Data (Consider lightly):\n'
+_SENTIMENT_INSTRUCTIONS = (
+    "\n\n"
+    "Instructions:\n"
+    "1. For each Forest Core Emotional Tag (Stillness, Spark, Courage, Reset, Joy, Clarity, Compassion, Resilience, Depth), assign a score between 0.0 and 1.0 reflecting its resonance in the reflection.\n"
+    "2. Identify any Core Shadow Tags (e.g., Burnout, Avoidance, Bitterness, Rigidity, Shame) present in the text and estimate their intensities (0.0 to 1.0). List them as 'active_shadow_tags' in the 'shadow_data' object.\n"
+    "3. Determine the overall 'sentiment_flow' of the text (improving, worsening, volatile, ambivalent, stable).\n"
+    "4. Calculate an 'ambivalence_score' (0.0 to 1.0) if conflicting signals are present.\n"
+    "5. Compute an overall 'final_score' normalized between -1.0 (very negative) and 1.0 (very positive).\n\n"
+    "Return ONLY a single valid JSON object with keys: 'emotional_fingerprint' (object mapping tags to scores), 'shadow_data' (object with 'active_shadow_tags' list and 'shadow_intensity' float), 'sentiment_flow' (string), 'ambivalence_score' (float), 'final_score' (float).\n\n"
+)
+_SENTIMENT_PROMPT_FOOTER = (
+    "Adhere strictly to System-Veil Language and the Sanctuary Directive principles in your internal processing, "
+    "outputting only the requested JSON structure."
+)
+
+
+def _error_result(error: str, raw: Any = "") -> dict:
+    """Error-shaped result; includes default keys expected by downstream logic.
+
+    Built on demand (the success path never needs it) with fresh nested containers,
+    since callers may mutate what they get back.
+    """
+    return {
+        "error": error,
+        "raw": raw,
+        "final_score": 0.0,
+        "emotional_fingerprint": {},
+        "shadow_data": {"active_shadow_tags": [], "shadow_intensity": 0.0},
+        "sentiment_flow": "unknown",
+        "ambivalence_score": 0.0,
+    }
+
 
 class SecretSauceSentimentEngineHybrid:
     """
@@ -69,6 +117,35 @@ class SecretSauceSentimentEngineHybrid:
         self.prompt_modifier = 1.0
         logger.debug("SecretSauceSentimentEngineHybrid initialized.")
 
+    @staticmethod
+    def _build_snapshot_context(snapshot: dict) -> str:
+        """Summarises the snapshot fields the sentiment prompt cares about, '; '-joined."""
+        component_state = snapshot.get("component_state", _EMPTY)
+        context_parts = [
+            f"Capacity: {snapshot.get('capacity', 0.5)}",
+            f"Shadow Score: {snapshot.get('shadow_score', 0.5)}",
+            f"Magnitude: {snapshot.get('magnitude', 5.0)}",
+        ]
+        dev_index_data = component_state.get("dev_index", _EMPTY)
+        if dev_index_data: context_parts.append(f"Development Index: {dumps_compact(dev_index_data)}")
+        active_archetypes = component_state.get("archetype_manager", _EMPTY).get("active_archetypes", _EMPTY)
+        if active_archetypes:
+            context_parts.append(f"Active Archetype(s): {', '.join(active_archetypes)}")
+        seeds = component_state.get("seed_manager", _EMPTY).get("seeds", ())
+        if seeds:
+            active_seeds = [s.get("seed_name", "Unknown") for s in seeds if s.get("status") == "active"]
+            if active_seeds: context_parts.append(f"Active Seeds: {', '.join(active_seeds)}")
+        practical_consequence_data = component_state.get("practical_consequence", _EMPTY)
+        if practical_consequence_data: context_parts.append(f"Practical Consequence Score: {practical_consequence_data.get('score', 'N/A'):.2f}")
+        hardware_config_data = snapshot.get("hardware_config", _EMPTY)
+        if hardware_config_data: context_parts.append(f"Hardware Config: {dumps_compact(hardware_config_data)}")
+        reflection_context_data = snapshot.get("reflection_context", _EMPTY)
+        priority = reflection_context_data.get("current_priority", "")
+        insight = reflection_context_data.get("recent_insight", "")
+        if priority or insight:
+            context_parts.append(f"Reflection Context: Priority='{priority}', Insight='{insight}'")
+        return "; ".join(filter(None, context_parts))
+
     async def analyze_emotional_field(self, text: str, snapshot: dict = None) -> dict:
         """
         Analyzes the emotional field of the input text using LLM, considering snapshot context.
@@ -81,68 +158,25 @@ class SecretSauceSentimentEngineHybrid:
             A dictionary containing the analysis results (emotional_fingerprint, shadow_data, etc.)
             or an error dictionary if parsing fails or validation specific to sentiment fails.
         """
-        # Default structure to return on error
-        default_error_return = {
-             "error": "Sentiment analysis failed",
-             "raw": "",
-             # Include default keys expected by downstream logic if possible
-             "final_score": 0.0,
-             "emotional_fingerprint": {},
-             "shadow_data": {"active_shadow_tags": [], "shadow_intensity": 0.0},
-             "sentiment_flow": "unknown",
-             "ambivalence_score": 0.0,
-        }
-
         if not snapshot:
             snapshot = {}
         if not isinstance(text, str) or not text.strip():
             logger.warning("Empty or invalid text provided to analyze_emotional_field.")
-            err = default_error_return.copy()
-            err["error"] = "Empty input text"
-            return err
-
-        # ... (Context assembly logic - assuming correct based on your previous code) ...
-        context_parts = []
-        context_parts.append(f"Capacity: {snapshot.get('capacity', 0.5)}")
-        context_parts.append(f"Shadow Score: {snapshot.get('shadow_score', 0.5)}")
-        context_parts.append(f"Magnitude: {snapshot.get('magnitude', 5.0)}")
-        dev_index_data = snapshot.get("component_state", {}).get("dev_index", {})
-        if dev_index_data: context_parts.append(f"Development Index: {json.dumps(dev_index_data)}")
-        archetype_manager_data = snapshot.get("component_state", {}).get("archetype_manager", {})
-        active_archetypes = archetype_manager_data.get("active_archetypes", {})
-        if active_archetypes:
-            active_names = list(active_archetypes.keys())
-            context_parts.append(f"Active Archetype(s): {', '.join(active_names)}")
-        seed_manager_data = snapshot.get("component_state", {}).get("seed_manager", {})
-        seeds = seed_manager_data.get("seeds", [])
-        if seeds:
-            active_seeds = [s.get("seed_name", "Unknown") for s in seeds if s.get("status") == "active"]
-            if active_seeds: context_parts.append(f"Active Seeds: {', '.join(active_seeds)}")
-        practical_consequence_data = snapshot.get("component_state", {}).get("practical_consequence", {})
-        if practical_consequence_data: context_parts.append(f"Practical Consequence Score: {practical_consequence_data.get('score', 'N/A'):.2f}")
-        hardware_config_data = snapshot.get("hardware_config", {})
-        if hardware_config_data: context_parts.append(f"Hardware Config: {json.dumps(hardware_config_data)}")
-        reflection_context_data = snapshot.get("reflection_context", {})
-        if reflection_context_data.get("current_priority") or reflection_context_data.get("recent_insight"):
-            context_parts.append(f"Reflection Context: Priority='{reflection_context_data.get('current_priority', '')}', Insight='{reflection_context_data.get('recent_insight', '')}'")
-        snapshot_context = "; ".join(filter(None, context_parts))
+            return _error_result("Empty input text")
+
+        snapshot_context = self._build_snapshot_context(snapshot)
 
 
         # ... (Prompt construction - assuming correct based on your previous code) ...
-        prompt = (
-             f"You are the Arbiter of The Forest—a poetic, deeply attuned guide tasked with interpreting the "
-             f"user's internal emotional landscape. Analyze the following user reflection in light of the provided contextual data. \n\n"
-             f'Reflection Text:\n"""\n{text}\n"""\n\n'
-             f"Contextual Data (Consider lightly):\n{snapshot_context}\n\n"
-             f"Instructions:\n"
-             f"1. For each Forest Core Emotional Tag (Stillness, Spark, Courage, Reset, Joy, Clarity, Compassion, Resilience, Depth), assign a score between 0.0 and 1.0 reflecting its resonance in the reflection.\n"
-             f"2. Identify any Core Shadow Tags (e.g., Burnout, Avoidance, Bitterness, Rigidity, Shame) present in the text and estimate their intensities (0.0 to 1.0). List them as 'active_shadow_tags' in the 'shadow_data' object.\n"
-             f"3. Determine the overall 'sentiment_flow' of the text (improving, worsening, volatile, ambivalent, stable).\n"
-             f"4. Calculate an 'ambivalence_score' (0.0 to 1.0) if conflicting signals are present.\n"
-             f"5. Compute an overall 'final_score' normalized between -1.0 (very negative) and 1.0 (very positive).\n\n"
-             f"Return ONLY a single valid JSON object with keys: 'emotional_fingerprint' (object mapping tags to scores), 'shadow_data' (object with 'active_shadow_tags' list and 'shadow_intensity' float), 'sentiment_flow' (string), 'ambivalence_score' (float), 'final_score' (float).\n\n"
-             f"Apply Prompt Modifier Factor: {self.prompt_modifier:.1f}. Adhere strictly to System-Veil Language and the Sanctuary Directive principles in your internal processing, outputting only the requested JSON structure."
-         )
+        prompt = "".join((
+            _SENTIMENT_PROMPT_HEADER,
+            text,
+            _SENTIMENT_CONTEXT_SEP,
+            snapshot_context,
+            _SENTIMENT_INSTRUCTIONS,
+            f"Apply Prompt Modifier Factor: {self.prompt_modifier:.1f}. ",
+            _SENTIMENT_PROMPT_FOOTER,
+        ))
         logger.info("Constructed sentiment analysis prompt (length: %d).", len(prompt))
 
         # --- MODIFICATION START: Call generate_response with specific model ---
@@ -164,28 +198,37 @@ class SecretSauceSentimentEngineHybrid:
             else:
                  # Should not happen if validation passed and it's a Pydantic model
                  logger.error("Validated sentiment data missing model_dump method.")
-                 err = default_error_return.copy()
-                 err["error"] = "Internal processing error after validation"
-                 return err
+                 return _error_result("Internal processing error after validation")
 
         except LLMValidationError as e:
             # Handle the specific validation error from llm.py
             logger.error("Sentiment analysis LLM call failed validation against SentimentResponseModel: %s", e)
-            error_result = default_error_return.copy()
-            error_result["error"] = "Sentiment validation failed"
-            if hasattr(e, 'data'): # Include raw data if available in exception
-                 error_result["raw"] = e.data
-            return error_result
+            # Include raw data if available in exception
+            return _error_result("Sentiment validation failed", raw=getattr(e, 'data', ""))
         except Exception as e:
             # Catch other potential errors from generate_response (timeouts, connection errors, etc.)
             logger.exception("Error during sentiment analysis LLM call or processing: %s", e)
-            error_result = default_error_return.copy()
-            error_result["error"] = f"Sentiment analysis failed: {e}"
             # Cannot capture raw response here as the error might have occurred before response
-            # error_result["raw"] = ""
-            return error_result
+            return _error_result(f"Sentiment analysis failed: {e}")
         # --- MODIFICATION END ---
 
+    async def analyze_batch(
+        self,
+        items: Iterable[Tuple[str, Optional[dict]]],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[dict]:
+        """
+        Runs analyze_emotional_field over (text, snapshot) pairs concurrently,
+        at most ``concurrency`` LLM calls in flight. Results keep input order;
+        failures come back as the usual error dicts.
+        """
+        sem = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def one(text: str, snapshot: Optional[dict]) -> dict:
+            async with sem:
+                return await self.analyze_emotional_field(text, snapshot)
+
+        return await asyncio.gather(*(one(t, s) for t, s in items))
 
     def to_dict(self) -> dict:
         """Serializes the engine's state."""
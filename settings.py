@@ -1,17 +1,25 @@
 # forest_app/config/settings.py
 
 import os
+from dataclasses import dataclass, field
 
+
+@dataclass(frozen=True, slots=True)
 class Settings:
+    # Env vars are read when Settings() is built (once, at import below); instances are immutable.
     # Ollama / LLM settings you already have…
-    llm_api_endpoint: str = os.getenv("LLM_API_ENDPOINT", "http://localhost:11434/api/generate")
-    llm_api_key: str      = os.getenv("LLM_API_KEY", "")
-    llm_model_name: str   = os.getenv("LLM_MODEL_NAME", "mistral")
+    llm_api_endpoint: str = field(
+        default_factory=lambda: os.getenv("LLM_API_ENDPOINT", "http://localhost:11434/api/generate")
+    )
+    llm_api_key: str      = field(default_factory=lambda: os.getenv("LLM_API_KEY", ""), repr=False)
+    llm_model_name: str   = field(default_factory=lambda: os.getenv("LLM_MODEL_NAME", "mistral"))
 
     # Database URL used by SQLAlchemy
-    db_connection_string: str = os.getenv(
-        "DATABASE_URL",
-        "sqlite:///./forest.db"     # or whatever default makes sense for you
+    db_connection_string: str = field(
+        default_factory=lambda: os.getenv(
+            "DATABASE_URL",
+            "sqlite:///./forest.db"     # or whatever default makes sense for you
+        )
     )
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -1,11 +1,18 @@
 import re
 import logging
 import math
+from collections import Counter
 from datetime import datetime
+from itertools import compress
+from operator import attrgetter
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Word tokens with surrounding punctuation stripped ("burnout." -> "burnout"); inner
+# apostrophes and hyphens are kept so "can't" and "self-hate" stay single words
+_WORD_RE = re.compile(r"\w+(?:['-]\w+)*")
+
 
 class ShadowEngine:
     """
@@ -34,6 +41,8 @@ class ShadowEngine:
             "guilt": 0.7,
         }
         self.negations = {"not", "never", "no"}
+        # Context-adjusted lexicon variants keyed by (low_capacity, reset_theme), built on demand
+        self._adjusted_cache = {}
 
         # Additional regex patterns for common shadow phrases
         self.pattern_lexicon = {
@@ -41,12 +50,50 @@ class ShadowEngine:
             r"\bstuck (in|on)\b": 0.3,
             r"\bwhat'?s the point\b": 0.4,
         }
+        self._compile_patterns()
 
         self.last_update = datetime.utcnow().isoformat()
 
+    def _compile_patterns(self):
+        """Fuses pattern_lexicon into one alternation (group gN = Nth pattern) for a single scan.
+
+        Call again after changing pattern_lexicon. The patterns must not overlap one
+        another in text, which holds for the phrase patterns above.
+        """
+        self._pattern_items = list(self.pattern_lexicon.items())
+        self._group_index = {f"g{i}": i for i in range(len(self._pattern_items))}
+        self._union_re = re.compile(
+            "|".join(f"(?P<g{i}>{p})" for i, (p, _) in enumerate(self._pattern_items))
+        )
+
+    def _adjusted_lexicon(self, low_capacity: bool, reset_theme: bool) -> dict:
+        """Returns the lexicon with the context adjustments applied, cached per case.
+
+        The cache is dropped by update_from_dict; clear _adjusted_cache after editing
+        lexicon directly.
+        """
+        key = (low_capacity, reset_theme)
+        adjusted = self._adjusted_cache.get(key)
+        if adjusted is None:
+            adjusted = self.lexicon.copy()
+            # Example: if capacity is very low, amplify impact of 'burnout', 'hopeless', and 'despair'
+            if low_capacity:
+                for word in ("burnout", "hopeless", "despair"):
+                    if word in adjusted:
+                        adjusted[word] *= 1.2
+            # Example: if resonance_theme is "reset", reduce the impact of "rigid"
+            if reset_theme and "rigid" in adjusted:
+                adjusted["rigid"] *= 0.8
+            self._adjusted_cache[key] = adjusted
+        return adjusted
+
     def _sigmoid(self, x: float, k: float = 1.0) -> float:
         """Optional sigmoid normalization function."""
-        return 1 / (1 + math.exp(-k * x))
+        # Clamp the exponent: beyond ±30 the result is 0/1 to double precision anyway,
+        # and math.exp raises OverflowError past ~709
+        kx = k * x
+        kx = -30.0 if kx < -30.0 else 30.0 if kx > 30.0 else kx
+        return 1.0 / (1.0 + math.exp(-kx))
 
     def analyze_text(self, text: str, context: dict = None) -> dict:
         """
@@ -68,50 +115,69 @@ class ShadowEngine:
         text_lower = text.lower()
         total_score = 0.0
         tag_scores = {}
-        words = text_lower.split()
-        skip_next = False
+        words = _WORD_RE.findall(text_lower)
 
-        # Adjust lexicon weights based on context (if provided)
-        adjusted_lexicon = self.lexicon.copy()
+        # Adjust lexicon weights based on context (if provided). The lexicon is only
+        # read below, so the base dict and the cached variants are used without copying.
+        adjusted_lexicon = self.lexicon
         if context:
-            capacity = context.get("capacity", 0.5)
-            resonance_theme = context.get("resonance_theme", "").lower()
-            # Example: if capacity is very low, amplify impact of 'burnout', 'hopeless', and 'despair'
-            if capacity < 0.3:
-                for key in ["burnout", "hopeless", "despair"]:
-                    if key in adjusted_lexicon:
-                        adjusted_lexicon[key] *= 1.2
-            # Example: if resonance_theme is "reset", reduce the impact of "rigid"
-            if resonance_theme == "reset":
-                if "rigid" in adjusted_lexicon:
-                    adjusted_lexicon["rigid"] *= 0.8
+            low_capacity = context.get("capacity", 0.5) < 0.3
+            reset_theme = context.get("resonance_theme", "").lower() == "reset"
+            if low_capacity or reset_theme:
+                adjusted_lexicon = self._adjusted_lexicon(low_capacity, reset_theme)
 
         # Process each word for lexicon-based scoring.
-        for i, word in enumerate(words):
-            if skip_next:
-                skip_next = False
-                continue
-            # Handle simple negation.
-            if word in self.negations:
-                if i + 1 < len(words):
-                    next_word = words[i + 1]
-                    if next_word in adjusted_lexicon:
-                        score = -adjusted_lexicon[next_word]
-                        tag_scores[next_word] = tag_scores.get(next_word, 0) + score
-                        total_score += score
-                        skip_next = True
-                continue
-            if word in adjusted_lexicon:
-                score = adjusted_lexicon[word]
-                tag_scores[word] = tag_scores.get(word, 0) + score
+        negations = self.negations
+        if negations.isdisjoint(adjusted_lexicon):
+            # Count words in C, then visit each distinct word once (first-occurrence order).
+            # A negation flips the sign of the lexicon word right after it, so each
+            # negated occurrence counts -1 instead of +1.
+            counts = Counter(words)
+            negated = Counter()
+            if not negations.isdisjoint(counts):
+                # compress() picks, in C, the words that directly follow a negation
+                followers = compress(words[1:], map(negations.__contains__, words))
+                negated = Counter(w for w in followers if w in adjusted_lexicon)
+            for word, n in counts.items():
+                weight = adjusted_lexicon.get(word)
+                if weight is None:
+                    continue
+                score = weight * (n - 2 * negated[word])
+                tag_scores[word] = score
                 total_score += score
-
-        # Use regex pattern matching to catch common phrases.
-        for pattern, weight in self.pattern_lexicon.items():
-            matches = re.findall(pattern, text_lower)
-            if matches:
+        else:
+            # A negation word is itself in the lexicon: keep the sequential walk,
+            # whose skip rules depend on word order.
+            skip_next = False
+            for i, word in enumerate(words):
+                if skip_next:
+                    skip_next = False
+                    continue
+                # Handle simple negation.
+                if word in negations:
+                    if i + 1 < len(words):
+                        next_word = words[i + 1]
+                        if next_word in adjusted_lexicon:
+                            score = -adjusted_lexicon[next_word]
+                            tag_scores[next_word] = tag_scores.get(next_word, 0) + score
+                            total_score += score
+                            skip_next = True
+                    continue
+                if word in adjusted_lexicon:
+                    score = adjusted_lexicon[word]
+                    tag_scores[word] = tag_scores.get(word, 0) + score
+                    total_score += score
+
+        # Use regex pattern matching to catch common phrases: one pass over the text,
+        # counted in C by group name, then only the patterns that hit are visited
+        # (in lexicon order), so cost doesn't grow with the size of pattern_lexicon.
+        group_counts = Counter(map(attrgetter("lastgroup"), self._union_re.finditer(text_lower)))
+        if group_counts:
+            group_index = self._group_index
+            for group in sorted(group_counts, key=group_index.__getitem__):
+                pattern, weight = self._pattern_items[group_index[group]]
                 tag_name = pattern  # using pattern as a key placeholder
-                increment = weight * len(matches)
+                increment = weight * group_counts[group]
                 tag_scores[tag_name] = tag_scores.get(tag_name, 0) + increment
                 total_score += increment
 
@@ -130,11 +196,13 @@ class ShadowEngine:
         # normalized_shadow = max(0.0, min(1.0, self._sigmoid(total_score, k=0.5)))
 
         logger.info(
-            "Shadow analysis complete. Raw score: %.2f; Normalized score: %.2f; Tags: %s",
+            "Shadow analysis complete. Raw score: %.2f; Normalized score: %.2f",
             total_score,
             normalized_shadow,
-            tag_scores,
         )
+        # Per-call tag detail is debug-only; the guard skips the call entirely at INFO
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Shadow tags: %s", tag_scores)
         return {"shadow_score": round(normalized_shadow, 2), "shadow_tags": tag_scores}
 
     def update_from_text(self, text: str, context: dict = None) -> float:
@@ -153,4 +221,5 @@ class ShadowEngine:
         """Updates the engine from a dictionary."""
         if "lexicon" in data:
             self.lexicon.update(data["lexicon"])
+            self._adjusted_cache.clear()
         self.last_update = data.get("last_update", self.last_update)
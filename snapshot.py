@@ -1,115 +1,179 @@
 # forest_app/core/snapshot.py
-import json
+from __future__ import annotations
+
+import importlib
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime
 # --- Ensure necessary typing imports ---
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+from forest_app.core.utils import dumps_indented
 
-# ---------- import managers / engines ----------
-# Assuming these imports are correct based on your project structure
+# ---------- managers / engines ----------
+# Imported lazily (first MemorySnapshot construction, or attribute access on this
+# module) so importing the snapshot type doesn't load every engine module.
 # Note: If these also need state saved/loaded via snapshot, ensure they have
 # to_dict/update_from_dict methods.
-from forest_app.modules.development_index import FullDevelopmentIndex
-from forest_app.modules.archetype import ArchetypeManager
-from forest_app.modules.seed import SeedManager
-from forest_app.modules.memory import MemorySystem
-from forest_app.modules.xp_mastery import XPMastery
+if TYPE_CHECKING:
+    from forest_app.modules.development_index import FullDevelopmentIndex
+    from forest_app.modules.archetype import ArchetypeManager
+    from forest_app.modules.seed import SeedManager
+    from forest_app.modules.memory import MemorySystem
+    from forest_app.modules.xp_mastery import XPMastery
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-
+_ENGINE_MODULES = {
+    "FullDevelopmentIndex": "forest_app.modules.development_index",
+    "ArchetypeManager": "forest_app.modules.archetype",
+    "SeedManager": "forest_app.modules.seed",
+    "MemorySystem": "forest_app.modules.memory",
+    "XPMastery": "forest_app.modules.xp_mastery",
+}
+
+
+def __getattr__(name: str):
+    """PEP 562 hook: imports an engine class on first access and caches it in globals."""
+    module_path = _ENGINE_MODULES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = getattr(importlib.import_module(module_path), name)
+    globals()[name] = cls
+    return cls
+
+
+def _engine_factory(name: str):
+    """default_factory that builds engine ``name``, or None (logged) if its module is missing."""
+    def _build():
+        cls = globals().get(name)
+        if cls is None:
+            try:
+                cls = __getattr__(name)
+            except ImportError as exc:
+                logger.error("Could not import %s; snapshot field left empty: %s", name, exc)
+                return None
+        return cls()
+    return _build
+
+
+# Plain attributes that update_from_dict copies straight from the input dict
+_SCALAR_ATTRS = frozenset({
+    "xp", "shadow_score", "capacity", "magnitude", "resistance",
+    "relationship_index", "hardware_config", "activated_state",
+    "core_state", "decor_state", "reflection_context",
+    "reflection_log", "task_backlog", "task_footprints",
+    "story_beats", "totems", "wants_cache", "partner_profiles",
+    "withering_level", "last_activity_unix", "current_path", "estimated_completion_date",
+    "template_metadata", "last_ritual_mode", "timestamp",
+    "conversation_history",
+})
+
+# Engine fields rehydrated through their own update_from_dict (attribute name == dict key)
+_ENGINE_ATTRS = ("dev_index", "archetype_manager", "seed_manager", "memory_system", "xp_mastery")
+
+
+def _default_activated_state() -> Dict[str, Any]:
+    return {"activated": False, "mode": None, "goal_set": False}
+
+
+def _default_hardware_config() -> Dict[str, Any]:
+    return {"ram": 0, "gpu_vram": 0, "cpu": "Unknown", "neural_engine": "Unknown"}
+
+
+def _default_reflection_context() -> Dict[str, Any]:
+    return {"themes": [], "recent_insight": "", "current_priority": ""}
+
+
+def _default_component_state() -> Dict[str, Any]:
+    # Note: component_state often stores the serialized dicts from managers/engines
+    return {
+        "sentiment_engine_calibration": {},
+        "metrics_engine": {},
+        "seed_manager": {},
+        "archetype_manager": {},
+        "dev_index": {},
+        "memory_system": {},
+        "xp_mastery": {},
+        "pattern_engine_config": {},
+        "emotional_integrity_index": {},
+        "desire_engine": {},
+        "resistance_engine": {},
+        "reward_index": {},
+        "last_issued_task_id": None,
+        # "conversation_history" could also be stored here if preferred,
+        # but keeping it top-level for easier access seems okay too.
+    }
+
+
+@dataclass(slots=True, eq=False, repr=False)
 class MemorySnapshot:
-    """Serializable container for user journey state."""
-
-    def __init__(self) -> None:
-        # ---- Core progress & wellbeing gauges ---------------------------
-        self.xp: int = 0
-        self.shadow_score: float = 0.50  # 0–1 (lower better)
-        self.capacity: float = 0.50      # available resources 0–1
-        self.magnitude: float = 5.00     # perceived impact 1–10
-        self.resistance: float = 0.00    # dynamic 0–1 opposition dial
-        self.relationship_index: float = 0.50  # overall relational health
-
-        # ---- Narrative scaffolding --------------------------------------
-        self.story_beats: List[Dict[str, Any]] = []  # [{beat_id, text, ts}, …]
-        self.totems: List[Dict[str, Any]] = []       # [{totem_id, name, …}, …]
-
-        # ---- Desire & pairing caches ------------------------------------
-        self.wants_cache: Dict[str, float] = {}            # {"travel:iceland": 0.8, …}
-        self.partner_profiles: Dict[str, Dict[str, Any]] = {}  # mirror profiles
-
-        # ---- Engagement maintenance ------------------------------------
-        self.withering_level: float = 0.00  # 0–1 engagement nudge
-
-        # ---- Activation & core pathing ----------------------------------
-        self.activated_state: Dict[str, Any] = {
-            "activated": False,
-            "mode": None,
-            "goal_set": False,
-        }
-        self.core_state: Dict[str, Any] = {}   # e.g. HTA tree
-        self.decor_state: Dict[str, Any] = {}  # UI or theme info
-
-        # ---- Path & deadlines -------------------------------------------
-        self.current_path: str = "structured"              # structured/hybrid/open
-        self.estimated_completion_date: Optional[str] = None # ISO formatted date
-
-        # ---- Managers / engines (ensure these have to_dict/update methods if stateful) ---
-        self.dev_index = FullDevelopmentIndex()
-        self.archetype_manager = ArchetypeManager()
-        self.seed_manager = SeedManager()
-        self.memory_system = MemorySystem()
-        self.xp_mastery = XPMastery()
-
-        # ---- Hardware & misc -------------------------------------------
-        self.hardware_config: Dict[str, Any] = {
-            "ram": 0,
-            "gpu_vram": 0,
-            "cpu": "Unknown",
-            "neural_engine": "Unknown",
-        }
-
-        # ---- Logs / context --------------------------------------------
-        self.reflection_context: Dict[str, Any] = {
-            "themes": [],
-            "recent_insight": "",
-            "current_priority": "",
-        }
-        self.reflection_log: List[Dict[str, Any]] = []
-        self.task_backlog: List[Dict[str, Any]] = []
-        self.task_footprints: List[Dict[str, Any]] = []
-
-        # --- ADDED: Attribute for conversation history ---
-        # Stores turns as {"role": "user" | "assistant", "content": "text"}
-        self.conversation_history: List[Dict[str, str]] = []
-        # --- END ADDED ---
-
-        # ---- Component state stubs for every live engine ----------------
-        # Note: component_state often stores the serialized dicts from managers/engines
-        self.component_state: Dict[str, Any] = {
-            "sentiment_engine_calibration": {},
-            "metrics_engine": {},
-            "seed_manager": {},
-            "archetype_manager": {},
-            "dev_index": {},
-            "memory_system": {},
-            "xp_mastery": {},
-            "pattern_engine_config": {},
-            "emotional_integrity_index": {},
-            "desire_engine": {},
-            "resistance_engine": {},
-            "reward_index": {},
-            "last_issued_task_id": None,
-            "last_activity_ts": None,
-            # "conversation_history" could also be stored here if preferred,
-            # but keeping it top-level for easier access seems okay too.
-        }
-
-        # ---- Misc meta --------------------------------------------------
-        self.template_metadata: Dict[str, Any] = {}
-        self.last_ritual_mode: str = "Trail"
-        self.timestamp: str = datetime.utcnow().isoformat()
+    """Serializable container for user journey state.
+
+    Declared as a slotted dataclass so every attribute always exists with a
+    typed default: callers read ``snap.x`` directly instead of going through
+    ``getattr(snap, "x", default)`` fallbacks.
+    """
+
+    # ---- Core progress & wellbeing gauges ---------------------------
+    xp: int = 0
+    shadow_score: float = 0.50  # 0–1 (lower better)
+    capacity: float = 0.50      # available resources 0–1
+    magnitude: float = 5.00     # perceived impact 1–10
+    resistance: float = 0.00    # dynamic 0–1 opposition dial
+    relationship_index: float = 0.50  # overall relational health
+
+    # ---- Narrative scaffolding --------------------------------------
+    story_beats: List[Dict[str, Any]] = field(default_factory=list)  # [{beat_id, text, ts}, …]
+    totems: List[Dict[str, Any]] = field(default_factory=list)       # [{totem_id, name, …}, …]
+
+    # ---- Desire & pairing caches ------------------------------------
+    wants_cache: Dict[str, float] = field(default_factory=dict)            # {"travel:iceland": 0.8, …}
+    partner_profiles: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # mirror profiles
+
+    # ---- Engagement maintenance ------------------------------------
+    withering_level: float = 0.00  # 0–1 engagement nudge
+    last_activity_unix: float = 0.0  # epoch seconds of last reflection/completion; 0 = never
+
+    # ---- Activation & core pathing ----------------------------------
+    activated_state: Dict[str, Any] = field(default_factory=_default_activated_state)
+    core_state: Dict[str, Any] = field(default_factory=dict)   # e.g. HTA tree
+    decor_state: Dict[str, Any] = field(default_factory=dict)  # UI or theme info
+    baseline_established: bool = False  # set by CLI onboarding
+
+    # ---- Path & deadlines -------------------------------------------
+    current_path: str = "structured"              # structured/hybrid/open
+    estimated_completion_date: Optional[str] = None # ISO formatted date
+
+    # ---- Managers / engines (ensure these have to_dict/update methods if stateful) ---
+    dev_index: FullDevelopmentIndex = field(default_factory=_engine_factory("FullDevelopmentIndex"))
+    archetype_manager: ArchetypeManager = field(default_factory=_engine_factory("ArchetypeManager"))
+    seed_manager: SeedManager = field(default_factory=_engine_factory("SeedManager"))
+    memory_system: MemorySystem = field(default_factory=_engine_factory("MemorySystem"))
+    xp_mastery: XPMastery = field(default_factory=_engine_factory("XPMastery"))
+
+    # ---- Hardware & misc -------------------------------------------
+    hardware_config: Dict[str, Any] = field(default_factory=_default_hardware_config)
+
+    # ---- Logs / context --------------------------------------------
+    reflection_context: Dict[str, Any] = field(default_factory=_default_reflection_context)
+    reflection_log: List[Dict[str, Any]] = field(default_factory=list)
+    task_backlog: List[Dict[str, Any]] = field(default_factory=list)
+    task_footprints: List[Dict[str, Any]] = field(default_factory=list)
+
+    # --- ADDED: Attribute for conversation history ---
+    # Stores turns as {"role": "user" | "assistant", "content": "text"}
+    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    # --- END ADDED ---
+
+    # ---- Component state stubs for every live engine ----------------
+    component_state: Dict[str, Any] = field(default_factory=_default_component_state)
+
+    # ---- Misc meta --------------------------------------------------
+    template_metadata: Dict[str, Any] = field(default_factory=dict)
+    last_ritual_mode: str = "Trail"
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialise entire snapshot to a dict (JSON‑safe)."""
@@ -140,6 +204,7 @@ class MemorySnapshot:
 
             # Engagement
             "withering_level": self.withering_level,
+            "last_activity_unix": self.last_activity_unix,
 
             # Activation / state
             "activated_state": self.activated_state,
@@ -187,27 +252,13 @@ class MemorySnapshot:
              logger.error("Invalid data passed to update_from_dict: expected dict, got %s", type(data))
              return
 
-        # Simple scalars and lists/dicts
-        for attr in [
-            "xp", "shadow_score", "capacity", "magnitude", "resistance",
-            "relationship_index", "hardware_config", "activated_state",
-            "core_state", "decor_state", "reflection_context",
-            "reflection_log", "task_backlog", "task_footprints",
-            "story_beats", "totems", "wants_cache", "partner_profiles",
-            "withering_level", "current_path", "estimated_completion_date",
-            "template_metadata", "last_ritual_mode", "timestamp",
-            # --- ADDED: Load conversation history ---
-            "conversation_history",
-            # --- END ADDED ---
-        ]:
-            if attr in data:
-                setattr(self, attr, data[attr])
-            # --- ADDED: Ensure conversation_history defaults to list if missing/null ---
-            elif attr == "conversation_history":
-                 # Set only if the attribute doesn't exist or is None after loop
-                 if not hasattr(self, attr) or getattr(self, attr) is None:
-                     setattr(self, attr, [])
-            # --- END ADDED ---
+        # Simple scalars and lists/dicts: only the keys actually present (set intersection
+        # in C), so sparse delta dicts cost little
+        for attr in _SCALAR_ATTRS.intersection(data):
+            setattr(self, attr, data[attr])
+        # Ensure conversation_history defaults to list if missing/null
+        if "conversation_history" not in data and self.conversation_history is None:
+            self.conversation_history = []
 
         # --- Ensure conversation_history is a list after potential loading ---
         if not isinstance(getattr(self, 'conversation_history', []), list):
@@ -232,11 +283,10 @@ class MemorySnapshot:
              elif key_in_data in data:
                   logger.warning("Engine %s not found or lacks update_from_dict method.", engine_attr_name)
 
-        safe_update_from_dict("dev_index", "dev_index")
-        safe_update_from_dict("archetype_manager", "archetype_manager")
-        safe_update_from_dict("seed_manager", "seed_manager")
-        safe_update_from_dict("memory_system", "memory_system")
-        safe_update_from_dict("xp_mastery", "xp_mastery")
+        # Engines whose key is absent would be a no-op, so skip the hasattr/callable probes
+        for engine_attr in _ENGINE_ATTRS:
+            if engine_attr in data:
+                safe_update_from_dict(engine_attr, engine_attr)
 
         # Component_state blob (Load this last, it might contain overrides or old state)
         loaded_cs = data.get("component_state")
@@ -265,8 +315,9 @@ class MemorySnapshot:
 
     def __str__(self) -> str:
         try:
-            # Use default=str for non-serializable objects like datetime, but handle others potentially
-            return json.dumps(self.to_dict(), indent=2, default=str)
+            # Non-serializable objects like datetime are rendered with str (orjson's
+            # encode error subclasses TypeError, so the fallback below still applies)
+            return dumps_indented(self.to_dict())
         except TypeError as exc:
             logger.error("Snapshot serialisation error: %s", exc)
             # Attempt a basic representation if full serialization fails
@@ -1,17 +1,26 @@
+import functools
+import heapq
 import json
 import logging
+import mmap
 from datetime import datetime
+from typing import Optional
 from collections import deque
 import os
+import time
+
+from forest_app.core.utils import dumps_compact, dumps_indented, loads_json
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+@functools.lru_cache(maxsize=1)
 def load_snapshot_config():
     """
     Load snapshot configuration from an external JSON file.
     If the file is not found or an error occurs, return default configuration.
+    The result is read once per process and shared; treat it as read-only.
     """
     config_path = os.path.join("forest_app", "config", "snapshot_config.json")
     try:
@@ -50,56 +59,104 @@ class CallbackTrigger:
     reaches a preset frequency.
     """
 
+    __slots__ = ("counter", "frequency", "last_snapshot", "_builder")
+
     def __init__(self, frequency: int = 5):
         self.counter = 0
         self.frequency = frequency
         self.last_snapshot = None
+        self._builder = CompressedSnapshotBuilder()  # Stateless after init; reused per trigger
 
     def register_interaction(self, full_snapshot) -> dict:
         self.counter += 1
         if self.counter >= self.frequency:
             self.counter = 0
-            builder = CompressedSnapshotBuilder()
-            self.last_snapshot = builder.build(full_snapshot)
-            logger.info("Snapshot triggered: %s", self.last_snapshot)
+            self.last_snapshot = self._builder.build(full_snapshot)
+            # Full snapshot contents only at DEBUG: repr of the dict is the costly part
+            logger.info("Snapshot triggered after %d interactions.", self.frequency)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Snapshot contents: %s", self.last_snapshot)
             return self.last_snapshot
         return None
 
     def force_trigger(self, full_snapshot) -> dict:
         self.counter = 0
-        builder = CompressedSnapshotBuilder()
-        self.last_snapshot = builder.build(full_snapshot)
-        logger.info("Forced snapshot: %s", self.last_snapshot)
+        self.last_snapshot = self._builder.build(full_snapshot)
+        logger.info("Forced snapshot.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Snapshot contents: %s", self.last_snapshot)
         return self.last_snapshot
 
     def get_last_snapshot(self) -> dict:
         return self.last_snapshot
 
 
+def _public_record(record: dict) -> dict:
+    """Renders a stored record's Unix timestamp as naive-UTC ISO; loaded records pass through."""
+    ts = record["timestamp"]
+    if isinstance(ts, float):
+        return {"timestamp": datetime.utcfromtimestamp(ts).isoformat(), "snapshot": record["snapshot"]}
+    return record
+
+
 class SnapshotRotatingSaver:
     """
-    Maintains a rolling backup of compressed snapshots in a deque.
+    Maintains a rolling backup of compressed snapshots in a fixed-size ring buffer.
     Intended for short-term (in-memory or file-based) backup; distinct from SQLSnapshotSaver.
     """
 
-    def __init__(self, max_snapshots: int = 10):
-        self.snapshots = deque(maxlen=max_snapshots)
+    __slots__ = ("_cap", "_buf", "_idx", "_full", "_log_path")
+
+    def __init__(self, max_snapshots: int = 10, log_path: Optional[str] = None):
+        # Ring buffer: slots are preallocated and overwritten in place once full
+        self._cap = max(1, int(max_snapshots))
+        self._buf = [None] * self._cap
+        self._idx = 0  # next slot to write
+        self._full = False
+        # Optional append-only NDJSON log: each store writes one line, O(1) per snapshot
+        self._log_path = log_path
 
     def store_snapshot(self, snapshot: dict):
-        record = {"timestamp": datetime.utcnow().isoformat(), "snapshot": snapshot}
-        self.snapshots.append(record)
+        # Stored as Unix seconds; the ISO string is only built when a record is read or logged
+        record = {"timestamp": time.time(), "snapshot": snapshot}
+        self._buf[self._idx] = record
+        self._idx = (self._idx + 1) % self._cap
+        if self._idx == 0:
+            self._full = True
+        if self._log_path:
+            try:
+                with open(self._log_path, "a", encoding="utf-8") as f:
+                    f.write(dumps_compact(_public_record(record)) + "\n")
+            except (IOError, TypeError) as e:
+                logger.error("Could not append snapshot to %s: %s", self._log_path, e)
         logger.info("Snapshot stored at %s", record["timestamp"])
 
+    def _records(self) -> list:
+        """Stored records, oldest first."""
+        if self._full:
+            return self._buf[self._idx:] + self._buf[:self._idx]
+        return self._buf[:self._idx]
+
+    def _replace_records(self, records):
+        """Refills the buffer with the newest ``_cap`` of ``records`` (oldest first)."""
+        kept = list(deque(records, maxlen=self._cap))
+        self._buf = kept + [None] * (self._cap - len(kept))
+        self._full = len(kept) == self._cap
+        self._idx = 0 if self._full else len(kept)
+
     def get_latest(self) -> dict:
-        return self.snapshots[-1] if self.snapshots else None
+        if not self._full and self._idx == 0:
+            return None
+        return _public_record(self._buf[self._idx - 1])
 
     def get_all(self) -> list:
-        return list(self.snapshots)
+        return [_public_record(r) for r in self._records()]
 
     def export_to_json(self, filepath: str):
         try:
-            with open(filepath, "w") as f:
-                json.dump(self.get_all(), f, indent=2)
+            payload = dumps_indented(self.get_all())
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(payload)
             logger.info("Snapshots exported to %s", filepath)
         except FileNotFoundError as fnf_error:
             logger.error(
@@ -112,9 +169,40 @@ class SnapshotRotatingSaver:
 
     def load_from_json(self, filepath: str):
         try:
-            with open(filepath, "r") as f:
+            with open(filepath, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                self.snapshots = deque(data, maxlen=self.snapshots.maxlen)
+                self._replace_records(data)
+            logger.info("Snapshots loaded from %s", filepath)
+        except FileNotFoundError as fnf_error:
+            logger.error(
+                "File not found during load (check '%s'): %s", filepath, fnf_error
+            )
+        except IOError as io_error:
+            logger.error("I/O error during load: %s", io_error)
+        except Exception as e:
+            logger.error("Unexpected error during load: %s", e)
+
+    def load_from_ndjson(self, filepath: str):
+        """Restores the newest ``max_snapshots`` records from an NDJSON log written by store_snapshot.
+
+        The file is memory-mapped and scanned backwards, so only the retained tail is parsed.
+        """
+        try:
+            with open(filepath, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    self._replace_records(())
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    lines = []
+                    stop = len(mm)
+                    while stop > 0 and len(lines) < self._cap:
+                        start = mm.rfind(b"\n", 0, stop) + 1
+                        line = mm[start:stop].strip()
+                        if line:
+                            lines.append(line)
+                        stop = start - 1
+            lines.reverse()
+            self._replace_records(loads_json(line) for line in lines)
             logger.info("Snapshots loaded from %s", filepath)
         except FileNotFoundError as fnf_error:
             logger.error(
@@ -131,24 +219,28 @@ class GPTMemorySync:
     Packages a compressed snapshot into a succinct context string suitable for injection into LLM prompts.
     """
 
+    __slots__ = ("synced_snapshot",)
+
     def __init__(self):
         self.synced_snapshot = None
 
     def inject_into_context(self, compressed_snapshot: dict) -> str:
         if not compressed_snapshot:
             return "No memory state available."
-        context_lines = [
-            f"XP: {compressed_snapshot.get('xp')}",
-            f"Shadow Score: {compressed_snapshot.get('shadow_score')}",
-            f"Capacity: {compressed_snapshot.get('capacity')}",
-            f"Magnitude: {compressed_snapshot.get('magnitude')}",
-            f"Top Tags: {', '.join(compressed_snapshot.get('top_tags', []))}",
-            f"Development Indexes: {json.dumps(compressed_snapshot.get('development_indexes', {}))}",
-            f"Last Ritual Mode: {compressed_snapshot.get('last_ritual_mode')}",
-        ]
+        cs = compressed_snapshot
+        # One f-string expression: no intermediate line list or join
+        context_string = (
+            f"XP: {cs.get('xp')}\n"
+            f"Shadow Score: {cs.get('shadow_score')}\n"
+            f"Capacity: {cs.get('capacity')}\n"
+            f"Magnitude: {cs.get('magnitude')}\n"
+            f"Top Tags: {', '.join(cs.get('top_tags', []))}\n"
+            f"Development Indexes: {dumps_compact(cs.get('development_indexes', {}))}\n"
+            f"Last Ritual Mode: {cs.get('last_ritual_mode')}"
+        )
         self.synced_snapshot = compressed_snapshot
-        context_string = "\n".join(context_lines)
-        logger.info("Injected snapshot context for LLM:\n%s", context_string)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Injected snapshot context for LLM:\n%s", context_string)
         return context_string
 
 
@@ -158,31 +250,34 @@ class CompressedSnapshotBuilder:
     The included fields can later be tuned based on prompt testing and configuration.
     """
 
+    __slots__ = ("config",)
+
     def __init__(self):
         self.config = load_snapshot_config()
 
     def build(self, full_snapshot) -> dict:
         top_tags = (
-            sorted(full_snapshot.active_tags.items(), key=lambda x: x[1], reverse=True)
+            heapq.nlargest(3, full_snapshot.active_tags.items(), key=lambda x: x[1])
             if hasattr(full_snapshot, "active_tags")
             else []
         )
+        # SeedManager.to_dict() is {"seeds": [...]}, so indexing it with [0] raised KeyError;
+        # take the first Seed directly and serialise only that one.
+        seeds = full_snapshot.seed_manager.get_all_seeds()
+        current_seed = seeds[0].to_dict() if seeds else {"name": "None", "status": "inactive"}
         compressed = {
             "xp": full_snapshot.xp,
             "shadow_score": full_snapshot.shadow_score,
             "capacity": full_snapshot.capacity,
             "magnitude": full_snapshot.magnitude,
-            "current_seed": (
-                full_snapshot.seed_manager.to_dict()[0]
-                if full_snapshot.seed_manager.to_dict()
-                else {"name": "None", "status": "inactive"}
-            ),
-            "top_tags": [tag for tag, _ in top_tags[:3]] if top_tags else [],
+            "current_seed": current_seed,
+            "top_tags": [tag for tag, _ in top_tags],
             "development_indexes": full_snapshot.dev_index.to_dict(),
             "last_ritual_mode": full_snapshot.last_ritual_mode,
             "timestamp": datetime.utcnow().isoformat(),
         }
-        logger.info("Compressed snapshot built: %s", compressed)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Compressed snapshot built: %s", compressed)
         return compressed
 
 
@@ -192,6 +287,8 @@ class SnapshotFlowController:
     storing backups via SnapshotRotatingSaver, and injecting context via GPTMemorySync.
     """
 
+    __slots__ = ("trigger", "saver", "memory_sync")
+
     def __init__(self, frequency: int = 5, max_snapshots: int = 10):
         self.trigger = CallbackTrigger(frequency=frequency)
         self.saver = SnapshotRotatingSaver(max_snapshots=max_snapshots)
@@ -17,9 +17,11 @@ The manager writes an ISO‑8601 `soft_deadline` string into each task
 
 from __future__ import annotations
 
+import functools
 import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Iterable
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterable, Optional
 
 from forest_app.core.snapshot import MemorySnapshot
 
@@ -33,6 +35,38 @@ def _iso(dt: datetime) -> str:
     return dt.replace(microsecond=0).isoformat() + "Z"
 
 
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO‑8601 string into a naive UTC datetime.
+
+    ``datetime.fromisoformat`` is the fast path (a trailing ``Z`` is dropped
+    first); anything it rejects goes to ``dateutil`` when that is installed.
+    Offset-aware results are converted to UTC so they compare with
+    ``datetime.utcnow()``. Raises ValueError if the string can't be parsed.
+    """
+    s = value[:-1] if value.endswith("Z") else value
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError as exc:
+        try:
+            from dateutil import parser as date_parser
+        except ImportError:
+            raise exc from None
+        try:
+            dt = date_parser.parse(value)
+        except (ValueError, OverflowError) as parse_exc:
+            raise ValueError(f"Unparseable ISO datetime: {value!r}") from parse_exc
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+@functools.lru_cache(maxsize=4096)
+def _iso_timestamp(value: str) -> float:
+    """Unix seconds for an ISO‑8601 string (naive means UTC); see :func:`_parse_iso`."""
+    return _parse_iso(value).replace(tzinfo=timezone.utc).timestamp()
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -44,6 +78,7 @@ def schedule_soft_deadlines(
     *,
     jitter_pct: float = 0.20,
     override_existing: bool = False,
+    rng: Optional[random.Random] = None,
 ) -> List[Dict[str, Any]]:
     """Assign `soft_deadline` fields to each task in *tasks*.
 
@@ -58,18 +93,23 @@ def schedule_soft_deadlines(
     override_existing : bool, optional
         If False (default), tasks that already have `soft_deadline` are
         left untouched.
+    rng : random.Random, optional
+        Source of blended-mode jitter. Defaults to the module-level
+        ``random`` functions (so ``random.seed`` still applies).
 
     Returns
     -------
     list of dict
         Reference to the same task dicts, updated.
     """
+    # Materialise once: *tasks* may be a one-shot iterator (e.g. a generator)
+    tasks = list(tasks)
     path = getattr(snapshot, "current_path", "structured").lower()
     if path == "open":
         # Ensure no lingering deadlines
         for t in tasks:
             t.pop("soft_deadline", None)
-        return list(tasks)
+        return tasks
 
     # Guard: we need an estimated completion date to schedule deadlines.
     if not snapshot.estimated_completion_date:
@@ -77,18 +117,25 @@ def schedule_soft_deadlines(
             "Snapshot missing `estimated_completion_date`; cannot generate soft deadlines."
         )
 
-    end_dt = datetime.fromisoformat(snapshot.estimated_completion_date)
-    now = datetime.utcnow()
-    if end_dt <= now:
+    # Duration math stays in Unix-seconds floats; no throwaway datetimes
+    end_ts = _iso_timestamp(snapshot.estimated_completion_date)
+    now_ts = time.time()
+    if end_ts <= now_ts:
         # Fallback: push end date one week ahead to avoid zero/negative span.
-        end_dt = now + timedelta(days=7)
+        end_ts = now_ts + 7 * 86400
 
-    total_span_sec = (end_dt - now).total_seconds()
-    num_tasks = len(list(tasks))
+    total_span_sec = end_ts - now_ts
+    num_tasks = len(tasks)
     if num_tasks == 0:
-        return list(tasks)
+        return tasks
 
     even_step = total_span_sec / num_tasks
+    # Loop invariants hoisted; deadlines are built from Unix seconds, which skips a
+    # timedelta and a datetime.replace per task (same whole-second "Z" format as _iso)
+    blended = path == "blended"
+    jitter_range = even_step * jitter_pct
+    uniform = (rng or random).uniform
+    from_ts = datetime.utcfromtimestamp
 
     updated = []
     for idx, task in enumerate(tasks, start=1):
@@ -100,14 +147,12 @@ def schedule_soft_deadlines(
         offset_sec = even_step * idx
 
         # Jitter for blended path
-        if path == "blended":
-            jitter_range = even_step * jitter_pct
-            offset_sec += random.uniform(-jitter_range, jitter_range)
+        if blended:
+            offset_sec += uniform(-jitter_range, jitter_range)
             # Clamp within [0, total_span]
             offset_sec = max(min(offset_sec, total_span_sec), 0)
 
-        deadline_dt = now + timedelta(seconds=offset_sec)
-        task["soft_deadline"] = _iso(deadline_dt)
+        task["soft_deadline"] = from_ts(int(now_ts + offset_sec)).isoformat() + "Z"
         updated.append(task)
 
     return updated
@@ -127,16 +172,43 @@ def schedule_backlog(snapshot: MemorySnapshot, *, override_existing=False) -> No
     )
 
 
+def deadline_timestamp(task: Dict[str, Any]) -> Optional[float]:
+    """Return the task’s soft deadline as Unix seconds (UTC), or None if absent/unparseable."""
+    sd = task.get("soft_deadline")
+    if not sd or not isinstance(sd, str):
+        return None
+    try:
+        return _iso_timestamp(sd)
+    except ValueError:
+        return None
+
+
 def hours_until_deadline(task: Dict[str, Any]) -> float:
     """Return hours until this task’s soft deadline (or float('inf') if none)."""
     sd = task.get("soft_deadline")
     if not sd:
         return float("inf")
     try:
-        return max(
-            (datetime.fromisoformat(sd.rstrip("Z")) - datetime.utcnow()).total_seconds()
-            / 3600,
-            0.0,
-        )
+        return max((_iso_timestamp(sd) - time.time()) / 3600, 0.0)
     except Exception:
         return float("inf")
+
+
+def hours_until_deadlines(tasks: Iterable[Dict[str, Any]]) -> List[float]:
+    """Batched :func:`hours_until_deadline`: one clock read for the whole list.
+
+    Use this to precompute sort keys instead of calling the single-task version
+    (and the clock) once per task.
+    """
+    now_ts = time.time()
+    hours: List[float] = []
+    for task in tasks:
+        sd = task.get("soft_deadline")
+        if not sd:
+            hours.append(float("inf"))
+            continue
+        try:
+            hours.append(max((_iso_timestamp(sd) - now_ts) / 3600, 0.0))
+        except Exception:
+            hours.append(float("inf"))
+    return hours
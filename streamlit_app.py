@@ -11,6 +11,21 @@ BACKEND_URL = "http://localhost:8000"
 COMMAND_ENDPOINT = f"{BACKEND_URL}/command"
 SET_GOAL_ENDPOINT = f"{BACKEND_URL}/onboarding/set_goal"
 ADD_CONTEXT_ENDPOINT = f"{BACKEND_URL}/onboarding/add_context"
+# Only the most recent messages are rendered each rerun; older ones stay in session state
+MAX_RENDERED_MESSAGES = 50
+
+
+def _api_session() -> requests.Session:
+    """Pooled HTTP session for this browser session, reused across reruns and turns.
+
+    Keep-alive means each /command round trip skips DNS and TCP (and TLS, for a
+    remote backend) setup after the first call. Kept in session_state rather than
+    a process-wide cache so cookies and auth headers never cross users.
+    """
+    session = st.session_state.get("api_session")
+    if session is None:
+        session = st.session_state.api_session = requests.Session()
+    return session
 
 # --- Initialize Session State ---
 # Use session state to store user ID, messages, and onboarding status
@@ -34,11 +49,15 @@ if "onboarding_status" not in st.session_state:
         })
 
 # --- Helper Function to Call Backend ---
+# Responses are deliberately not wrapped in st.cache_data: every endpoint here is a
+# state-changing POST (set goal, add context, process a reflection/command), so a
+# cached reply would skip real work on the backend. Reruns don't replay calls either,
+# since st.chat_input only returns a prompt on the run that submitted it.
 def call_forest_api(endpoint: str, user_id: str, payload_data: dict):
     """Sends data to the Forest OS backend API."""
     payload = {"user_id": user_id, **payload_data}
     try:
-        response = requests.post(endpoint, json=payload, timeout=60) # Add timeout
+        response = _api_session().post(endpoint, json=payload, timeout=60) # Add timeout
         # Check for specific HTTP errors indicating onboarding state issues
         if response.status_code == 403:
              try:
@@ -79,7 +98,10 @@ st.caption(f"Session User ID: {st.session_state.user_id}")
 # Set height to manage screen real estate
 message_container = st.container(height=600, border=False)
 with message_container:
-    for message in st.session_state.messages:
+    hidden_count = len(st.session_state.messages) - MAX_RENDERED_MESSAGES
+    if hidden_count > 0:
+        st.caption(f"{hidden_count} earlier messages not shown.")
+    for message in st.session_state.messages[-MAX_RENDERED_MESSAGES:]:
         with st.chat_message(message["role"]):
             st.markdown(message["content"]) # Use markdown for potential formatting
 
@@ -87,9 +109,13 @@ with message_container:
 # The prompt variable will contain the user's input when they press Enter
 if prompt := st.chat_input("Enter your reflection or command..."):
     # 1. Add user message to chat history immediately
+    first_new_message = len(st.session_state.messages)
     st.session_state.messages.append({"role": "user", "content": prompt})
 
-    # 2. Display user message in chat message container (rerun will handle this)
+    # 2. Display user message in chat message container right away
+    with message_container:
+        with st.chat_message("user"):
+            st.markdown(prompt)
 
     # 3. Determine which API endpoint to call based on onboarding status
     response_data = None
@@ -164,5 +190,9 @@ if prompt := st.chat_input("Enter your reflection or command..."):
         # Add successful assistant response to chat history
         st.session_state.messages.append({"role": "assistant", "content": assistant_response_content})
 
-    # 6. Rerun the script to update the display including the new messages
-    st.rerun()
\ No newline at end of file
+    # 6. Render the replies added this turn into the existing container instead of
+    #    calling st.rerun(), which would re-render the whole history a second time
+    with message_container:
+        for message in st.session_state.messages[first_new_message + 1:]:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
\ No newline at end of file
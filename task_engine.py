@@ -10,6 +10,7 @@ TaskEngine: Generates the next actionable task for the user by combining:
 
 import hashlib
 import logging
+import secrets
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
@@ -24,6 +25,7 @@ from forest_app.config.constants import (
     PATTERN_PRIORITY_BOOST,
     REFLECTION_PRIORITY_BOOST,
 )
+from forest_app.core.utils import dumps_compact
 from forest_app.modules.snapshot_flow import SnapshotFlowController
 from forest_app.modules.pattern_id import PatternIdentificationEngine
 
@@ -49,6 +51,7 @@ except ImportError:
             self.estimated_energy = "medium"
             self.estimated_time = "medium"
             self.depth = kwargs.get("depth", 0)
+            self.relevant_indexes = kwargs.get("relevant_indexes", [])
 
         def dependencies_met(self, node_map: Dict[str, "HTANode"]) -> bool:
             return True
@@ -74,12 +77,11 @@ except ImportError:
 
         def flatten(self) -> List[HTANode]:
             nodes: List[HTANode] = []
-            def _recurse(n: HTANode):
+            stack = [self.root] if self.root else []
+            while stack:
+                n = stack.pop()
                 nodes.append(n)
-                for c in n.children:
-                    _recurse(c)
-            if self.root:
-                _recurse(self.root)
+                stack.extend(reversed(n.children))
             return nodes
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -99,6 +101,8 @@ class TaskEngine:
         }
         self.flow = SnapshotFlowController(frequency=5)
         self.pattern_engine = PatternIdentificationEngine()
+        # (content digest, flattened nodes, id -> node) for the last HTA tree scored
+        self._hta_cache = None
 
     def _is_dependency_met(self, node: HTANode, node_map: Dict[str, HTANode]) -> bool:
         try:
@@ -107,7 +111,30 @@ class TaskEngine:
             logger.exception("Dependency check failed for %s: %s", node.id, e)
             return False
 
+    def _hta_nodes(self, hta_data: Dict[str, Any]):
+        """Builds and flattens the HTA tree, reusing the last result while its content is unchanged."""
+        key = hashlib.blake2b(
+            dumps_compact(hta_data, sort_keys=True).encode(), digest_size=16
+        ).digest()
+        cached = self._hta_cache
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+        nodes = HTATree.from_dict(hta_data).flatten()
+        node_map = {n.id: n for n in nodes}
+        self._hta_cache = (key, nodes, node_map)
+        return nodes, node_map
+
     def select_and_score_nodes(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Scored candidates (see _score_candidates), highest score first.
+        """
+        return sorted(self._score_candidates(snapshot), key=lambda x: x["score"], reverse=True)
+
+    def _top_candidate(self, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Highest-scoring candidate in one O(N) pass (first wins on ties, as in the sorted list)."""
+        return max(self._score_candidates(snapshot), key=lambda x: x["score"], default=None)
+
+    def _score_candidates(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Flatten HTA, filter by dependencies and resources, then score each candidate:
           score = 
@@ -120,49 +147,54 @@ class TaskEngine:
         if not hta_data:
             return []
 
-        tree = HTATree.from_dict(hta_data)
-        nodes = tree.flatten()
-        node_map = {n.id: n for n in nodes}
+        nodes, node_map = self._hta_nodes(hta_data)
         capacity = snapshot.get("capacity", 0.5)
 
         dev_index = snapshot.get("dev_index", {})
         reflection_intensity = snapshot.get("reflection_context", {}).get("recent_intensity", 0.0)
         pattern_scores = self.pattern_engine.score(snapshot.get("reflection_log", []))
 
+        # Bound lookups and the per-call constant term, hoisted out of the node loop
+        resource_get = RESOURCE_MAP.get
+        dev_index_get = dev_index.get
+        pattern_get = pattern_scores.get
+        reflection_boost = REFLECTION_PRIORITY_BOOST * reflection_intensity
+
         candidates = []
         for n in nodes:
             if n.status not in ("pending", "active"):
                 continue
-            if not self._is_dependency_met(n, node_map):
+            # Most nodes have no dependencies: skip the guarded method call for them
+            if n.depends_on and not self._is_dependency_met(n, node_map):
                 continue
-            energy = RESOURCE_MAP.get(n.estimated_energy, 0.5)
-            time_ = RESOURCE_MAP.get(n.estimated_time, 0.5)
+            energy = resource_get(n.estimated_energy, 0.5)
+            time_ = resource_get(n.estimated_time, 0.5)
             if max(energy, time_) > capacity:
                 continue
 
             score = n.priority
-            for dim in getattr(n, "relevant_indexes", []):
-                dev_val = dev_index.get(dim, 0.5)
+            for dim in n.relevant_indexes:
+                dev_val = dev_index_get(dim, 0.5)
                 score += DEV_INDEX_PRIORITY_BOOST * (1 - dev_val)
-            score += PATTERN_PRIORITY_BOOST * pattern_scores.get(n.id, 0.0)
-            score += REFLECTION_PRIORITY_BOOST * reflection_intensity
+            if pattern_scores:  # usually empty when there is no reflection history yet
+                score += PATTERN_PRIORITY_BOOST * pattern_get(n.id, 0.0)
+            score += reflection_boost
 
             candidates.append({"node": n, "score": score})
 
-        return sorted(candidates, key=lambda x: x["score"], reverse=True)
+        return candidates
 
     def _select_task_based_on_seed(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
         """
         Choose the top-scoring HTA node, or fallback to a Reflection template.
         """
-        scored = self.select_and_score_nodes(snapshot)
-        node = scored[0]["node"] if scored else None
+        top = self._top_candidate(snapshot)
+        node = top["node"] if top else None
 
-        task_id = hashlib.md5(
-            f"{snapshot.get('xp',0)}-{datetime.utcnow().isoformat()}".encode()
-        ).hexdigest()[:8]
+        task_id = secrets.token_hex(4)  # 8 random hex chars, same shape as the old md5 prefix
 
         introspective = "Reflect on how this task advances your journey."
+        created_at = datetime.utcnow().isoformat()
 
         if node:
             base = {
@@ -170,8 +202,8 @@ class TaskEngine:
                 "title": node.title,
                 "description": node.description,
                 "tier": snapshot.get("current_tier", "Bud"),
-                "metadata": {"hta_depth": getattr(node, "depth", 0)},
-                "created_at": datetime.utcnow().isoformat(),
+                "metadata": {"hta_depth": int(getattr(node, "depth", 0) or 0)},
+                "created_at": created_at,
                 "introspective_prompt": introspective,
             }
         else:
@@ -182,7 +214,7 @@ class TaskEngine:
                 "description": tpl["base_description"],
                 "tier": snapshot.get("current_tier", "Bud"),
                 "metadata": {},
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": created_at,
                 "introspective_prompt": introspective,
             }
         return base
@@ -195,10 +227,10 @@ class TaskEngine:
 
         # ─── Rule‑based magnitude assignment (1–10 scale) ────────────
         mag = TASK_TIER_BASE_MAGNITUDE.get(base_task["tier"], TASK_DEFAULT_MAGNITUDE)
-        depth = base_task.get("metadata", {}).get("hta_depth")
-        if isinstance(depth, (int, float)):
-            norm_depth = min(depth, HTA_MAX_DEPTH_FOR_MAG_NORM) / HTA_MAX_DEPTH_FOR_MAG_NORM
-            mag += norm_depth * TASK_MAGNITUDE_DEPTH_WEIGHT
+        # hta_depth is normalised to an int when the task is built; template tasks have none (0)
+        depth = base_task["metadata"].get("hta_depth", 0)
+        norm_depth = min(depth, HTA_MAX_DEPTH_FOR_MAG_NORM) / HTA_MAX_DEPTH_FOR_MAG_NORM
+        mag += norm_depth * TASK_MAGNITUDE_DEPTH_WEIGHT
 
         # clamp to [MAGNITUDE_MIN_VALUE, MAGNITUDE_MAX_VALUE]
         mag = max(MAGNITUDE_MIN_VALUE, min(MAGNITUDE_MAX_VALUE, mag))
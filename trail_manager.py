@@ -1,9 +1,17 @@
 import logging
+import secrets
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+
+
+def _render_ts(value: Union[float, str]) -> str:
+    """ISO string for a stored timestamp: Unix seconds are formatted (naive UTC), strings pass through."""
+    if isinstance(value, float):
+        return datetime.utcfromtimestamp(value).isoformat()
+    return value
 
 
 class TrailEvent:
@@ -17,6 +25,10 @@ class TrailEvent:
         timestamp (str): The UTC timestamp when the event was recorded (ISO format).
     """
 
+    # Created per logged event: slots drop the per-instance __dict__. The timestamp is
+    # kept as Unix seconds and only formatted as ISO when read (e.g. by to_dict).
+    __slots__ = ("event_type", "description", "metadata", "_timestamp")
+
     def __init__(
         self,
         event_type: str,
@@ -27,10 +39,24 @@ class TrailEvent:
         self.event_type = event_type
         self.description = description
         # Initialize metadata; if object_class is provided, add it under a reserved key.
+        # Always copied: events are history, so later changes to the caller's dict
+        # must not rewrite them.
         self.metadata = metadata.copy() if metadata else {}
         if object_class:
             self.metadata["object_class"] = object_class
-        self.timestamp = datetime.utcnow().isoformat()
+        self._timestamp = time.time()
+
+    @property
+    def timestamp(self) -> str:
+        ts = self._timestamp
+        if isinstance(ts, float):
+            # Format once; an event's timestamp never changes after creation
+            ts = self._timestamp = _render_ts(ts)
+        return ts
+
+    @timestamp.setter
+    def timestamp(self, value: Union[float, str]):
+        self._timestamp = value
 
     def to_dict(self) -> dict:
         return {
@@ -42,13 +68,14 @@ class TrailEvent:
 
     @classmethod
     def from_dict(cls, data: dict) -> "TrailEvent":
-        event = cls(
-            event_type=data.get("event_type", "unknown"),
-            description=data.get("description", ""),
-            metadata=data.get("metadata", {}),
-            object_class=data.get("metadata", {}).get("object_class"),
-        )
-        event.timestamp = data.get("timestamp", datetime.utcnow().isoformat())
+        # Fill the slots directly: skips __init__'s clock read and the object_class
+        # round-trip (it is already inside metadata)
+        event = object.__new__(cls)
+        event.event_type = data.get("event_type", "unknown")
+        event.description = data.get("description", "")
+        metadata = data.get("metadata")
+        event.metadata = metadata.copy() if metadata else {}
+        event._timestamp = data["timestamp"] if "timestamp" in data else time.time()
         return event
 
 
@@ -65,23 +92,45 @@ class Trail:
         updated_at (str): Timestamp when the trail was last updated.
     """
 
+    # created_at/updated_at are stored like TrailEvent.timestamp (Unix seconds until read)
+    __slots__ = ("trail_id", "trail_type", "description", "events", "_created_at", "_updated_at")
+
     def __init__(self, trail_id: str, trail_type: str, description: str):
         self.trail_id = trail_id
         self.trail_type = trail_type
         self.description = description
         self.events: List[TrailEvent] = []
-        self.created_at = datetime.utcnow().isoformat()
-        self.updated_at = self.created_at
+        self._created_at = time.time()
+        self._updated_at = self._created_at
+
+    @property
+    def created_at(self) -> str:
+        return _render_ts(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value: Union[float, str]):
+        self._created_at = value
+
+    @property
+    def updated_at(self) -> str:
+        return _render_ts(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value: Union[float, str]):
+        self._updated_at = value
 
     def add_event(self, event: TrailEvent):
         self.events.append(event)
-        self.updated_at = datetime.utcnow().isoformat()
-        logger.info("Added event to trail '%s': %s", self.trail_id, event.to_dict())
+        self._updated_at = time.time()
+        # Log arguments are evaluated eagerly, so the full event dict is built only at DEBUG
+        logger.info("Added '%s' event to trail '%s'.", event.event_type, self.trail_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Event details: %s", event.to_dict())
 
     def update_event(self, index: int, new_event: TrailEvent):
         if 0 <= index < len(self.events):
             self.events[index] = new_event
-            self.updated_at = datetime.utcnow().isoformat()
+            self._updated_at = time.time()
             logger.info(
                 "Updated event at index %d for trail '%s'.", index, self.trail_id
             )
@@ -97,7 +146,7 @@ class Trail:
             "trail_id": self.trail_id,
             "trail_type": self.trail_type,
             "description": self.description,
-            "events": [event.to_dict() for event in self.events],
+            "events": [e.to_dict() for e in self.events],
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
@@ -109,8 +158,9 @@ class Trail:
             trail_type=data.get("trail_type", ""),
             description=data.get("description", ""),
         )
-        trail.created_at = data.get("created_at", datetime.utcnow().isoformat())
-        trail.updated_at = data.get("updated_at", trail.created_at)
+        if "created_at" in data:
+            trail.created_at = data["created_at"]
+        trail.updated_at = data.get("updated_at", trail._created_at)
         trail.events = [
             TrailEvent.from_dict(event_data) for event_data in data.get("events", [])
         ]
@@ -132,11 +182,7 @@ class TrailManager:
         """
         Creates a new trail with a unique identifier.
         """
-        import hashlib
-
-        trail_id = hashlib.md5(
-            f"{description}-{datetime.utcnow()}".encode("utf-8")
-        ).hexdigest()[:8]
+        trail_id = secrets.token_hex(4)
         trail = Trail(trail_id=trail_id, trail_type=trail_type, description=description)
         self.trails[trail_id] = trail
         logger.info("Created new trail '%s' of type '%s'.", trail_id, trail_type)
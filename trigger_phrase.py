@@ -1,35 +1,63 @@
+import functools
 import json
 import logging
 import os
+import sys
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
+# Fixed responses returned as-is (not copied) by the handlers below; treat handler
+# results as read-only. Plain dicts rather than MappingProxyType so they stay
+# JSON-serialisable.
+_NO_TRIGGER_RESPONSE = {
+    "triggered": False,
+    "message": "No trigger detected.",
+    "context_injection": None,
+}
+_DECOR_RESPONSE = {
+    "triggered": True,
+    "message": "Decor changes applied: persistent task commitment enabled and daily-specific tags activated.",
+    "context_injection": None,
+}
+_AUDIT_RESPONSE = {
+    "triggered": True,
+    "message": "Scores audited: XP, Shadow, Capacity, and Development Index details are logged.",
+    "context_injection": None,
+}
+_INTEGRATE_MEMORY_RESPONSE = {
+    "triggered": True,
+    "message": "ChatGPT memory integrated successfully.",
+    "context_injection": None,
+}
 
+
+@functools.lru_cache(maxsize=1)
 def load_trigger_config():
     """
     Loads trigger phrase mappings from an external JSON file. If unable to load, defaults are used.
     Expected JSON format: { "activate the forest": "activate", ... }
+    The file is read once per process; the shared result is a read-only mapping.
     """
     config_path = os.path.join("forest_app", "config", "trigger_config.json")
     try:
         with open(config_path, "r") as f:
             config = json.load(f)
             logger.info("Loaded trigger configuration from %s", config_path)
-            return config
+            return MappingProxyType({sys.intern(k): v for k, v in config.items()})
     except Exception as e:
         logger.warning(
             "Could not load trigger configuration from %s: %s. Using default mapping.",
             config_path,
             e,
         )
-    return {
+    return MappingProxyType({
         "activate the forest": "activate",
         "forest, change the decor": "change_decor",
         "forest, audit the scores": "audit_scores",
         "forest, show me the running to-do list": "show_todo",
         "forest, integrate memory": "integrate_memory",
-    }
+    })
 
 
 class TriggerPhraseHandler:
@@ -49,21 +77,27 @@ class TriggerPhraseHandler:
             "show_todo": self._handle_show_todo,
             "integrate_memory": self._handle_integrate_memory,
         }
+        # Normalised phrase -> (action, handler), resolved once so each utterance costs
+        # a single dict probe. Keys are stripped/lowercased like the input they match.
+        self._dispatch = {
+            sys.intern(phrase.strip().lower()): (action_key, self.handlers[action_key])
+            for phrase, action_key in self.trigger_map.items()
+            if action_key in self.handlers
+        }
 
     def handle_trigger_phrase(self, user_input: str, full_snapshot) -> dict:
         command = user_input.strip().lower()
-        action_key = self.trigger_map.get(command)
-        if action_key and action_key in self.handlers:
+        match = self._dispatch.get(command)
+        if match is not None:
+            action_key, handler = match
             logger.info(
                 "Trigger phrase '%s' detected (action: %s).", command, action_key
             )
-            return self.handlers[action_key](full_snapshot)
-        logger.info("No trigger detected for input: '%s'", command)
-        return {
-            "triggered": False,
-            "message": "No trigger detected.",
-            "context_injection": None,
-        }
+            return handler(full_snapshot)
+        # Runs for every ordinary utterance, so it is debug-only
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("No trigger detected for input: '%s'", command)
+        return _NO_TRIGGER_RESPONSE
 
     def _handle_activate(self, full_snapshot) -> dict:
         compressed = self.flow.trigger.build(full_snapshot)
@@ -76,16 +110,11 @@ class TriggerPhraseHandler:
 
     def _handle_change_decor(self, full_snapshot) -> dict:
         # Stub: Implement decor change logic.
-        return {
-            "triggered": True,
-            "message": "Decor changes applied: persistent task commitment enabled and daily-specific tags activated.",
-            "context_injection": None,
-        }
+        return _DECOR_RESPONSE
 
     def _handle_audit_scores(self, full_snapshot) -> dict:
         # Stub: Return a simple audit message.
-        audit_message = "Scores audited: XP, Shadow, Capacity, and Development Index details are logged."
-        return {"triggered": True, "message": audit_message, "context_injection": None}
+        return _AUDIT_RESPONSE
 
     def _handle_show_todo(self, full_snapshot) -> dict:
         if hasattr(full_snapshot, "task_backlog") and full_snapshot.task_backlog:
@@ -105,8 +134,4 @@ class TriggerPhraseHandler:
 
     def _handle_integrate_memory(self, full_snapshot) -> dict:
         # Stub: Simulate memory integration.
-        return {
-            "triggered": True,
-            "message": "ChatGPT memory integrated successfully.",
-            "context_injection": None,
-        }
+        return _INTEGRATE_MEMORY_RESPONSE
@@ -1,16 +1,80 @@
 # forest_app/core/utils.py
 
+import json
+from typing import Sequence
+
 from forest_app.config.constants import MAGNITUDE_MIN_VALUE, MAGNITUDE_MAX_VALUE
 
+try:
+    import orjson  # C-accelerated encoder; optional
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # Optional; enables the vectorised normalize_magnitudes path
+except ImportError:
+    np = None
+
+# Magnitude bounds folded once at import, so normalize_magnitude skips the subtraction per call
+_MAG_MIN = float(MAGNITUDE_MIN_VALUE)
+_MAG_SPAN = float(MAGNITUDE_MAX_VALUE - MAGNITUDE_MIN_VALUE)
+
+
+def dumps_compact(obj, sort_keys: bool = False) -> str:
+    """Serialise ``obj`` to compact JSON text, using orjson when it is installed.
+
+    ``sort_keys`` gives a canonical form suitable for content hashing. Values that
+    aren't JSON-native are rendered with ``str``.
+    """
+    if orjson is not None:
+        # Non-str keys are coerced to strings like json.dumps does, not rejected
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, default=str)
+
+
+def dumps_indented(obj) -> str:
+    """Serialise ``obj`` to 2-space indented JSON text for logs and ``__str__``."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+def loads_json(data):
+    """Parse JSON text or bytes, using orjson when it is installed.
+
+    Decode errors are ``json.JSONDecodeError`` either way (orjson's subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def normalize_magnitude(raw: float) -> float:
     """
     Convert a raw 1–10 magnitude into a 0–1 normalized value for scoring
     without altering the raw magnitude itself.
     """
-    span = MAGNITUDE_MAX_VALUE - MAGNITUDE_MIN_VALUE
-    if span <= 0:
+    if _MAG_SPAN <= 0:
         return 0.0
-    norm = (raw - MAGNITUDE_MIN_VALUE) / span
-    return max(0.0, min(1.0, norm))
+    norm = (raw - _MAG_MIN) / _MAG_SPAN
+    # Inline clamp instead of two builtin max/min calls (NaN still maps to 1.0)
+    return 0.0 if norm < 0.0 else norm if norm <= 1.0 else 1.0
+
 
+def normalize_magnitudes(raws: Sequence[float]):
+    """
+    Batch form of :func:`normalize_magnitude` for scoring passes over many raws.
 
+    Returns a NumPy array when NumPy is installed (one vectorised pass), otherwise a list.
+    """
+    if np is not None:
+        arr = np.asarray(raws, dtype=np.float64)
+        if _MAG_SPAN <= 0:
+            return np.zeros_like(arr)
+        norm = np.clip((arr - _MAG_MIN) / _MAG_SPAN, 0.0, 1.0)
+        norm[np.isnan(norm)] = 1.0  # Match the scalar version's NaN handling
+        return norm
+    return [normalize_magnitude(raw) for raw in raws]
@@ -1,10 +1,13 @@
 # forest_app/modules/xp_mastery.py
 
 import logging
+from bisect import bisect_right
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+
+# max_xp of the open-ended final stage
+_LAST_STAGE_MAX = float("inf")
 
 class XPMastery:
     """
@@ -36,10 +39,49 @@ class XPMastery:
         },
         "Becoming": {
             "min_xp": 600,
-            "max_xp": float("inf"),
+            "max_xp": _LAST_STAGE_MAX,
             "challenge_type": "Integration Prompt",
         },
     }
+    # Stage lookup table sorted by min_xp, for a bisect in get_current_stage.
+    # Rebuild both if XP_STAGES changes.
+    _STAGE_ROWS = sorted(
+        ((p["min_xp"], p["max_xp"], name, p["challenge_type"]) for name, p in XP_STAGES.items()),
+        key=lambda row: row[0],
+    )
+    _STAGE_MINS = [row[0] for row in _STAGE_ROWS]
+    _LAST_STAGE_IDX = len(_STAGE_ROWS) - 1
+
+    # Concrete action text per challenge type, used by generate_challenge_content.
+    _CHALLENGE_ACTIONS = {
+        "Naming Desire": (
+            "Select one tangible object or action that symbolizes your deepest desire. "
+            "Write it on a durable card or journal and place it somewhere visible every day."
+        ),
+        "Showing Up": (
+            "Commit to a specific appointment or activity. "
+            "Schedule a meeting with someone influential or sign up for a skill-building class."
+        ),
+        "Softening Shadow": (
+            "Pick one recurring challenge and take a stress-relieving action. "
+            "For example, reach out for counseling, do a relaxation routine, or set a boundary."
+        ),
+        "Harmonizing Seeds": (
+            "Link two of your goals with a concrete plan. "
+            "Maybe create a vision board or schedule a day combining creative and organizational tasks."
+        ),
+        "Integration Prompt": (
+            "Create a tangible artifact of your journey—a manifesto, art piece, or community project—"
+            "to showcase your integrated self."
+        ),
+    }
+    _DEFAULT_CHALLENGE_ACTION = "Reflect on a concrete step to advance your personal journey."
+    _CHALLENGE_TEMPLATE = (
+        "Mastery Challenge for the {stage} Stage:\n"
+        "Your task is '{challenge_type}'.\n"
+        "Concrete action: {action}\n"
+        "Focus on a real-world step that impacts you tangibly and document your plan."
+    )
 
     def __init__(self):
         # Nothing to initialize for now—methods are stateless beyond XP_STAGES
@@ -75,13 +117,16 @@ class XPMastery:
           - min_xp
           - max_xp
         """
-        for stage, params in self.XP_STAGES.items():
-            if params["min_xp"] <= xp < params["max_xp"]:
+        # Last stage whose min_xp <= xp; the max_xp test rejects gaps, inf and NaN
+        idx = bisect_right(self._STAGE_MINS, xp) - 1
+        if idx >= 0:
+            min_xp, max_xp, stage, challenge_type = self._STAGE_ROWS[idx]
+            if xp < max_xp:
                 return {
                     "stage": stage,
-                    "challenge_type": params["challenge_type"],
-                    "min_xp": params["min_xp"],
-                    "max_xp": params["max_xp"],
+                    "challenge_type": challenge_type,
+                    "min_xp": min_xp,
+                    "max_xp": max_xp,
                 }
         return {
             "stage": "Unknown",
@@ -101,41 +146,8 @@ class XPMastery:
         """
         info = self.get_current_stage(xp)
         ct = info["challenge_type"]
-
-        if ct == "Naming Desire":
-            act = (
-                "Select one tangible object or action that symbolizes your deepest desire. "
-                "Write it on a durable card or journal and place it somewhere visible every day."
-            )
-        elif ct == "Showing Up":
-            act = (
-                "Commit to a specific appointment or activity. "
-                "Schedule a meeting with someone influential or sign up for a skill-building class."
-            )
-        elif ct == "Softening Shadow":
-            act = (
-                "Pick one recurring challenge and take a stress-relieving action. "
-                "For example, reach out for counseling, do a relaxation routine, or set a boundary."
-            )
-        elif ct == "Harmonizing Seeds":
-            act = (
-                "Link two of your goals with a concrete plan. "
-                "Maybe create a vision board or schedule a day combining creative and organizational tasks."
-            )
-        elif ct == "Integration Prompt":
-            act = (
-                "Create a tangible artifact of your journey—a manifesto, art piece, or community project—"
-                "to showcase your integrated self."
-            )
-        else:
-            act = "Reflect on a concrete step to advance your personal journey."
-
-        content = (
-            f"Mastery Challenge for the {info['stage']} Stage:\n"
-            f"Your task is '{ct}'.\n"
-            f"Concrete action: {act}\n"
-            "Focus on a real-world step that impacts you tangibly and document your plan."
-        )
+        act = self._CHALLENGE_ACTIONS.get(ct, self._DEFAULT_CHALLENGE_ACTION)
+        content = self._CHALLENGE_TEMPLATE.format(stage=info["stage"], challenge_type=ct, action=act)
 
         challenge = {
             "stage":          info["stage"],
@@ -143,7 +155,9 @@ class XPMastery:
             "challenge_content": content,
             "triggered_at":   datetime.utcnow().isoformat(),
         }
-        logger.info("Generated Mastery Challenge: %s", challenge)
+        logger.info("Generated Mastery Challenge for stage '%s'.", info["stage"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Mastery Challenge details: %s", challenge)
         return challenge
 
     def check_xp_stage(self, snapshot) -> dict:
@@ -151,28 +165,30 @@ class XPMastery:
         If the user is within 10 XP of the next stage threshold, generate
         and return a Mastery Challenge; otherwise return {}.
         """
-        # Ensure snapshot has an 'xp' attribute
-        if not hasattr(snapshot, 'xp'):
-             logger.warning("Snapshot object missing 'xp' attribute in check_xp_stage.")
-             return {}
+        try:
+            current_xp = snapshot.xp
+        except AttributeError:
+            logger.warning("Snapshot object missing 'xp' attribute in check_xp_stage.")
+            return {}
 
-        current_xp = snapshot.xp
-        info = self.get_current_stage(current_xp)
         threshold = 10 # XP_MASTERY_PROXIMITY_THRESHOLD could be used from constants
 
-        # Handle cases where max_xp might be infinity for the last stage
-        if info["max_xp"] == float("inf"):
-            xp_to_next = float("inf") # Effectively never triggers for the last stage
+        # Same bisect as get_current_stage; the open-ended last stage (and NaN, which
+        # bisects past the end) has no next threshold, so it never triggers.
+        idx = bisect_right(self._STAGE_MINS, current_xp) - 1
+        if idx < self._LAST_STAGE_IDX:
+            # Below the first stage counts as "Unknown", whose max_xp is 0
+            xp_to_next = (self._STAGE_ROWS[idx][1] if idx >= 0 else 0) - current_xp
         else:
-            xp_to_next = info["max_xp"] - current_xp
+            xp_to_next = _LAST_STAGE_MAX
 
         if 0 <= xp_to_next <= threshold:
-            # Ensure snapshot has a to_dict method or handle appropriately
-            if hasattr(snapshot, 'to_dict') and callable(snapshot.to_dict):
-                 snapshot_dict = snapshot.to_dict()
+            to_dict = getattr(snapshot, "to_dict", None)
+            if callable(to_dict):
+                snapshot_dict = to_dict()
             else:
-                 logger.warning("Snapshot object missing 'to_dict' method in check_xp_stage. Passing empty dict.")
-                 snapshot_dict = {}
+                logger.warning("Snapshot object missing 'to_dict' method in check_xp_stage. Passing empty dict.")
+                snapshot_dict = {}
             return self.generate_challenge_content(current_xp, snapshot_dict)
 
         logger.info("XP stage not ready for a challenge (need %.2f more XP).", xp_to_next)